@@ -1,9 +1,19 @@
 import argparse
 import math
 import random
-from typing import List, Optional, Self
+from typing import Iterator, List, Optional, Self, Tuple
 from pprint import pprint
 
+from curve_count import count_points
+
+try:
+    from curve_enum import MAX_P, PointEnumerator
+except ImportError:  # без NumPy точки перебираются циклом на Python
+    MAX_P, PointEnumerator = 0, None
+
+# По сколько x iter_points переводит массивы в объекты Point
+_ITER_CHUNK = 4096
+
 
 class EllipticCurve:
     def __init__(self, a: int, b: int, p: int):
@@ -14,6 +24,7 @@ class EllipticCurve:
         self.p = p
         self._points_cache: Optional[List["Point"]] = None
         self._order_cache: Optional[int] = None
+        self._enumerator: Optional["PointEnumerator"] = None
 
 
     def is_point_on_curve(self, x, y) -> bool:
@@ -27,18 +38,17 @@ class EllipticCurve:
             cached = self._points_cache.copy()
             return cached
 
+        if self.p < MAX_P:
+            xs, ys = self.point_arrays(limit=limit)
+            points = [Point._trusted(self, x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+            points.append(Point.infinity(self))
+            if limit is None:
+                self._points_cache = points.copy()
+            return points
+
         points: List[Point] = []
         for x in range(self.p):
-            rhs = (x**3 + self.a * x + self.b) % self.p
-            if rhs == 0:
-                points.append(Point(self, x, 0))
-            else:
-                legendre = pow(rhs, (self.p - 1) // 2, self.p)
-                if legendre == 1:
-                    y = Point.mod_sqrt(rhs, self.p)
-                    points.append(Point(self, x, y))
-                    if y != 0:
-                        points.append(Point(self, x, (-y) % self.p))
+            points.extend(self._points_at(x))
             if limit is not None and len(points) >= limit:
                 break
 
@@ -49,41 +59,65 @@ class EllipticCurve:
 
         return points
 
-    def order(self, max_points_to_try=10) -> int:
-        if self._order_cache is not None:
-            return self._order_cache
-
-        p = self.p
-        h_min = p + 1 - 2 * math.isqrt(p)
-        h_max = p + 1 + 2 * math.isqrt(p)
-
-        current_lcm = 1
-
-        for i in range(max_points_to_try):
-            try:
-                P = self.random_point()
-                if P.is_infinity():
-                    continue
-            except ValueError:
-                continue 
-
-            M = P.order()
-
-            if M == 0:
-                continue
-
-            current_lcm = _lcm(current_lcm, M)
-
-            possible_orders = []
-            for N in range(h_min, h_max + 1):
-                if N % current_lcm == 0:
-                    possible_orders.append(N)
-            
-            if len(possible_orders) == 1:
-                self._order_cache = possible_orders[0]
-                return self._order_cache
-
-        raise RuntimeError("Не удалось однозначно определить порядок кривой.")
+    def _points_at(self, x: int) -> List["Point"]:
+        rhs = (x**3 + self.a * x + self.b) % self.p
+        if rhs == 0:
+            return [Point._trusted(self, x, 0)]
+        if pow(rhs, (self.p - 1) // 2, self.p) != 1:
+            return []
+        y = Point.mod_sqrt(rhs, self.p)
+        if y == 0:
+            return [Point._trusted(self, x, y)]
+        return [Point._trusted(self, x, y), Point._trusted(self, x, (-y) % self.p)]
+
+    def iter_points(self, x_start: int = 0, x_stop: Optional[int] = None) -> Iterator["Point"]:
+        # Точки с x_start <= x < x_stop по возрастанию x без построения списка: продолжить
+        # перебор можно с любого x. Бесконечно удаленная точка выдается последней,
+        # если диапазон доходит до p, поэтому при разбиении x_ranges она встретится один раз
+        x_stop = self.p if x_stop is None else min(x_stop, self.p)
+        if self.p < MAX_P:
+            for xs, ys in self.iter_point_arrays(x_start, x_stop, _ITER_CHUNK):
+                for x, y in zip(xs.tolist(), ys.tolist()):
+                    yield Point._trusted(self, x, y)
+        else:
+            for x in range(x_start, x_stop):
+                yield from self._points_at(x)
+        if x_stop == self.p:
+            yield Point.infinity(self)
+
+    def iter_point_arrays(self, x_start: int = 0, x_stop: Optional[int] = None, chunk: Optional[int] = None) -> Iterator[tuple]:
+        # Те же аффинные точки блоками массивов (xs, ys) по chunk значений x.
+        # Память: таблица корней (4p байт) и один блок
+        enumerator = self._get_enumerator()
+        x_stop = self.p if x_stop is None else min(x_stop, self.p)
+        chunk = chunk or enumerator.chunk
+        for start in range(x_start, x_stop, chunk):
+            yield enumerator.arrays(start, min(start + chunk, x_stop))
+
+    def x_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        # Делит [0, p) на parts диапазонов x для параллельных потребителей iter_points
+        step = -(-self.p // parts)
+        return [(start, min(start + step, self.p)) for start in range(0, self.p, step)]
+
+    def point_arrays(self, x_start: int = 0, x_stop: Optional[int] = None, limit: Optional[int] = None):
+        # Аффинные точки с x_start <= x < x_stop двумя массивами NumPy (xs, ys) без создания объектов Point.
+        # Таблица корней строится один раз на кривую, нужен NumPy и p < 2^31
+        return self._get_enumerator().arrays(x_start, x_stop, limit)
+
+    def _get_enumerator(self) -> "PointEnumerator":
+        if self._enumerator is None:
+            if PointEnumerator is None or self.p >= MAX_P:
+                raise RuntimeError("Для векторизованного перебора точек нужен NumPy и p < 2^31")
+            self._enumerator = PointEnumerator(self.a, self.b, self.p)
+        return self._enumerator
+
+    def order(self, method: Optional[str] = None) -> int:
+        # Детерминированный подсчет точек: перебор для малых p, метод Местре (шаг
+        # младенца-великана) до 2^64 и алгоритм Шуфа для больших p. method - "naive",
+        # "bsgs" или "schoof", чтобы выбрать метод явно
+        if self._order_cache is None:
+            self._order_cache = count_points(self.a, self.b, self.p, method)
+        return self._order_cache
 
     def random_point(self) -> "Point":
         while True:
@@ -91,29 +125,32 @@ class EllipticCurve:
             rhs = (x**3 + self.a * x + self.b) % self.p
             try:
                 y = Point.mod_sqrt(rhs, self.p)
-                return Point(self, x, y)
+                return Point._trusted(self, x, y)
             except ValueError:
                 continue
 
     def prime_order_subgroups(self) -> List[List["Point"]]:
+        # Подгруппа простого порядка порождается любой своей неединичной точкой,
+        # поэтому точки уже найденных подгрупп пропускаются без вычисления порядка.
+        # Кроме самих подгрупп, в памяти только множество их точек
         subgroups: List[List[Point]] = []
-        seen_signatures = set()
+        covered = set()
 
-        for point in self.enumerate_points():
-            if point.is_infinity():
+        for point in self.iter_points():
+            if point.is_infinity() or point in covered:
                 continue
 
             ord_point = point.order()
             if not _is_prime(ord_point):
                 continue
 
-            subgroup = [k * point for k in range(ord_point)]
-            signature = _subgroup_signature(subgroup)
-
-            if signature in seen_signatures:
-                continue
+            subgroup = [Point.infinity(self)]
+            current = point
+            for _ in range(1, ord_point):
+                subgroup.append(current)
+                current += point
 
-            seen_signatures.add(signature)
+            covered.update(subgroup)
             subgroups.append(subgroup)
 
         return subgroups
@@ -123,6 +160,8 @@ class EllipticCurve:
 
 
 class Point:
+    __slots__ = ("curve", "x", "y", "_order_cache")
+
     def __init__(self, curve: EllipticCurve, x: int, y: int):
         self.curve = curve
         self.x = x
@@ -133,6 +172,16 @@ class Point:
             if not curve.is_point_on_curve(x, y):
                 raise ValueError("Точка не лежит на данной кривой.")
 
+    @classmethod
+    def _trusted(cls, curve: EllipticCurve, x: Optional[int], y: Optional[int]) -> Self:
+        # Для результатов арифметики: точка заведомо на кривой, проверка не нужна
+        point = object.__new__(cls)
+        point.curve = curve
+        point.x = x
+        point.y = y
+        point._order_cache = None
+        return point
+
     def order(self) -> int:
         if self._order_cache is not None:
             return self._order_cache
@@ -212,11 +261,11 @@ class Point:
     def __neg__(self):
         if self.x is None or self.y is None:
             return self
-        return Point(self.curve, self.x, (-self.y) % self.curve.p)
+        return Point._trusted(self.curve, self.x, (-self.y) % self.curve.p)
 
     @classmethod
     def infinity(cls, curve: EllipticCurve) -> Self:
-        return cls(curve, None, None)
+        return cls._trusted(curve, None, None)
 
     def is_infinity(self) -> bool:
         return self.x is None and self.y is None
@@ -242,11 +291,11 @@ class Point:
             return self
 
         if self.x == other.x and self.y != other.y:
-            return Point(self.curve, None, None)
+            return Point._trusted(self.curve, None, None)
 
         if self.x == other.x:
             if self.y == 0:
-                return Point(self.curve, None, None)
+                return Point._trusted(self.curve, None, None)
             slope = (3 * self.x**2 + self.curve.a) * pow(2 * self.y, -1, self.curve.p)
         else:
             slope = (other.y - self.y) * pow(other.x - self.x, -1, self.curve.p)
@@ -256,10 +305,10 @@ class Point:
         x_r = (slope**2 - self.x - other.x) % self.curve.p
         y_r = (slope * (self.x - x_r) - self.y) % self.curve.p
 
-        return Point(self.curve, x_r, y_r)
+        return Point._trusted(self.curve, x_r, y_r)
 
     def __rmul__(self, n: int):
-        result = Point(self.curve, None, None)
+        result = Point._trusted(self.curve, None, None)
         temp = self
 
         while n > 0:
@@ -329,22 +378,6 @@ def _is_prime(n: int, iterations: int = 5) -> bool:
     return True
 
 
-def _subgroup_signature(points: List[Point]):
-    def key(point: Point):
-        if point.is_infinity():
-            return (0, 0, 0)
-        return (1, point.x, point.y)
-
-    ordered = sorted(points, key=key)
-    return tuple(key(point) for point in ordered)
-
-
-def _lcm(a: int, b: int) -> int:
-    if a == 0 or b == 0:
-        return 0
-    return abs(a * b) // math.gcd(a, b)
-
-
 def main():
     curve = EllipticCurve(3, 6, 29)
     point = Point(curve, 26, 17)
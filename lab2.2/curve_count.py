@@ -0,0 +1,591 @@
+import decimal
+import math
+from typing import Iterator
+
+try:
+    from curve_enum import MAX_P, PointEnumerator
+except ImportError:  # без NumPy простой подсчет идет циклом на Python
+    MAX_P, PointEnumerator = 0, None
+
+# Границы автоматического выбора метода: перебор, шаг младенца-великана (Местре), Шуф
+NAIVE_MAX_P = 1 << 16
+BSGS_MAX_P = 1 << 64
+# Алгоритм Шуфа набирает модули l, пока кандидатов на след больше этого числа,
+# остальное добирает шаг младенца-великана
+_BSGS_RANGE = 1 << 42
+# Больше шагов младенца в памяти не держим, остаток добирается шагами великана
+_BABY_MAX = 1 << 18
+# Сколько сложений точек шага младенца-великана делят одно обращение по модулю p
+_LANES = 256
+# Сколько точек кривой и ее кручения пробуется, прежде чем сдаться
+_MAX_POINTS = 64
+# С какой длины многочлены перемножаются через decimal: для больших чисел libmpdec
+# умножает теоретико-числовым преобразованием, а int - алгоритмом Карацубы
+_DECIMAL_MIN_LEN = 320
+_DECIMAL = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+def count_points(a: int, b: int, p: int, method: str = None) -> int:
+    """
+    Число точек кривой y^2 = x^3 + ax + b (mod p) вместе с бесконечно удаленной
+
+    :param: method: "naive", "bsgs" или "schoof"; по умолчанию выбирается по размеру p
+    :return: #E(F_p)
+    """
+    if method is None:
+        method = "naive" if p < NAIVE_MAX_P else "bsgs" if p < BSGS_MAX_P else "schoof"
+    try:
+        count = _METHODS[method]
+    except KeyError:
+        raise ValueError(f"Неизвестный метод подсчета точек: {method}") from None
+    return count(a, b, p)
+
+
+def count_naive(a: int, b: int, p: int) -> int:
+    """
+    Подсчет перебором всех x: для каждого x точек столько, сколько корней у x^3 + ax + b
+
+    :return: #E(F_p)
+    """
+    if PointEnumerator is not None and p < MAX_P:
+        return PointEnumerator(a, b, p).count()
+    total = 1
+    for x in range(p):
+        rhs = (x * x * x + a * x + b) % p
+        if rhs == 0 or p == 2:
+            total += 1
+        elif pow(rhs, (p - 1) // 2, p) == 1:
+            total += 2
+    return total
+
+
+def count_bsgs(a: int, b: int, p: int) -> int:
+    """
+    Метод Местре: порядок ищется в интервале Хассе шагом младенца-великана по точкам
+    кривой и ее квадратичного кручения, пока не останется один кандидат. Работает
+    за O(p^(1/4)) сложений точек
+
+    :return: #E(F_p)
+    """
+    return _resolve_trace(a % p, b % p, p, 0, 1)
+
+
+def count_schoof(a: int, b: int, p: int, bsgs_range: int = _BSGS_RANGE) -> int:
+    """
+    Алгоритм Шуфа: след Фробениуса t = p + 1 - #E считается по модулю малых простых l
+    через многочлены деления, вычеты склеиваются по китайской теореме об остатках.
+    Модули набираются, пока в интервале Хассе |t| <= 2 sqrt(p) больше bsgs_range
+    кандидатов, оставшиеся различаются шагом младенца-великана
+
+    :param: bsgs_range: Сколько кандидатов оставить на шаг младенца-великана;
+        при bsgs_range = 1 след находится одним алгоритмом Шуфа
+    :return: #E(F_p)
+    """
+    a %= p
+    b %= p
+    width = 2 * math.isqrt(4 * p) + 1
+    trace, modulus = 0, 1
+    for l in _primes():
+        if width <= modulus * bsgs_range:
+            break
+        if l == p:
+            continue
+        residue = trace_mod(a, b, p, l)
+        trace += modulus * ((residue - trace) * pow(modulus, -1, l) % l)
+        modulus *= l
+    return _resolve_trace(a, b, p, trace, modulus)
+
+
+def trace_mod(a: int, b: int, p: int, l: int) -> int:
+    """
+    След Фробениуса по модулю простого l != p из характеристического уравнения
+    phi^2 - t phi + p = 0 на точках l-кручения.
+
+    Вычисления идут в кольце F_p[x] / (psi_l): общая точка l-кручения - это (x, y)
+    с y^2 = x^3 + ax + b =: f. Чтобы обойтись без y, точки переносятся на изоморфную
+    кривую v^2 = u^3 + a f^2 u + b f^3 заменой (x, y Y) -> (f x, f^2 Y); на ней
+    складываются в координатах Якоби, без обращений в кольце
+
+    :return: t mod l
+    """
+    a %= p
+    b %= p
+    f = [b, a, 0, 1]
+    if l == 2:
+        # t четно ровно тогда, когда есть точка порядка 2, то есть корень f в F_p
+        ring = _PolyRing(f, p)
+        xp = ring.pow([0, 1], p)
+        return 0 if len(_poly_gcd(ring.sub(xp, [0, 1]), f, p)) > 1 else 1
+
+    psi = division_polynomial(a, b, p, l)
+    lead = pow(psi[-1], -1, p)
+    ring = _PolyRing([c * lead % p for c in psi], p)
+
+    xp = ring.pow([0, 1], p)
+    # y^p = y f^((p - 1) / 2), y^(p^2) = y A A(x^p)
+    A = ring.pow(f, (p - 1) // 2)
+    xpp, Ap = ring.compose([xp, A], xp)
+
+    f2 = ring.sqr(f)
+    curve_a = ring.scale(f2, a)
+    point = (ring.mul(f, [0, 1]), f2)
+    phi = (ring.mul(f, xp), ring.mul(f2, A))
+    phi2 = (ring.mul(f, xpp), ring.mul(f2, ring.mul(A, Ap)))
+
+    q = p % l
+    if q <= l // 2:
+        X, Y, Z = _jacobian_mul(ring, curve_a, point, q)
+    else:
+        X, Y, Z = _jacobian_mul(ring, curve_a, point, l - q)
+        Y = ring.neg(Y)
+
+    H = ring.sub(ring.mul(phi2[0], ring.sqr(Z)), X)
+    if len(_poly_gcd(H, ring.h, p)) > 1:
+        # На части точек phi^2 P = +-qP. Если phi^2 P = -qP, то t phi P = 0 и t = 0.
+        # Если phi^2 P = qP, то t^2 = 4q (mod l), и phi P = wP для w^2 = q
+        if pow(q, (l - 1) // 2, l) != 1:
+            return 0
+        w = next(w for w in range(1, l) if w * w % l == q)
+        X, Y, Z = _jacobian_mul(ring, curve_a, point, w)
+        ZZ = ring.sqr(Z)
+        g = _poly_gcd(ring.sub(ring.mul(phi[0], ZZ), X), ring.h, p)
+        if len(g) == 1:
+            return 0
+        ey = ring.sub(ring.mul(phi[1], ring.mul(ZZ, Z)), Y)
+        return 2 * w % l if not _poly_rem(ey, g, p) else -2 * w % l
+
+    XS, YS, ZS = _jacobian_add_affine(ring, (X, Y, Z), phi2)
+    ZS2 = ring.sqr(ZS)
+    ZS3 = ring.mul(ZS2, ZS)
+    R = (phi[0], phi[1], [1])
+    for tau in range(1, (l - 1) // 2 + 1):
+        if tau == 2:
+            R = _jacobian_double(ring, curve_a, R)
+        elif tau > 2:
+            R = _jacobian_add_affine(ring, R, phi)
+        X, Y, Z = R
+        ZZ = ring.sqr(Z)
+        if ring.equal(ring.mul(XS, ZZ), ring.mul(X, ZS2)):
+            if ring.equal(ring.mul(YS, ring.mul(ZZ, Z)), ring.mul(Y, ZS3)):
+                return tau
+            return l - tau
+    raise RuntimeError(f"Не удалось найти след Фробениуса по модулю {l}")
+
+
+def division_polynomial(a: int, b: int, p: int, n: int) -> list[int]:
+    """
+    Многочлен деления psi_n кривой y^2 = x^3 + ax + b над F_p. Для четного n
+    psi_n делится на y, и возвращается psi_n / y
+
+    :return: Коэффициенты от младшего к старшему
+    """
+    a %= p
+    b %= p
+    f = [b, a, 0, 1]
+    f2 = _poly_mul(f, f, p)
+    half = pow(2, -1, p)
+    cache = {
+        0: [],
+        1: [1],
+        2: [2 % p],
+        3: [-a * a % p, 12 * b % p, 6 * a % p, 0, 3 % p],
+        4: [c * 4 % p for c in (-8 * b * b - a**3, -4 * a * b, -5 * a * a, 20 * b, 5 * a, 0, 1)],
+    }
+
+    def psi(m: int) -> list[int]:
+        if m not in cache:
+            k = m // 2
+            if m % 2:
+                left = _poly_mul(psi(k + 2), _poly_mul(psi(k), _poly_mul(psi(k), psi(k), p), p), p)
+                right = _poly_mul(psi(k - 1), _poly_mul(psi(k + 1), _poly_mul(psi(k + 1), psi(k + 1), p), p), p)
+                # Из двух произведений y^4 = f^2 входит в то, где множители четного индекса
+                if k % 2:
+                    right = _poly_mul(right, f2, p)
+                else:
+                    left = _poly_mul(left, f2, p)
+                cache[m] = _poly_sub(left, right, p)
+            else:
+                inner = _poly_sub(
+                    _poly_mul(psi(k + 2), _poly_mul(psi(k - 1), psi(k - 1), p), p),
+                    _poly_mul(psi(k - 2), _poly_mul(psi(k + 1), psi(k + 1), p), p),
+                    p,
+                )
+                cache[m] = [c * half % p for c in _poly_mul(psi(k), inner, p)]
+        return cache[m]
+
+    return psi(n)
+
+
+def _primes():
+    yield 2
+    found = []
+    candidate = 3
+    while True:
+        if all(candidate % q for q in found):
+            found.append(candidate)
+            yield candidate
+        candidate += 2
+
+
+def _resolve_trace(a: int, b: int, p: int, trace: int, modulus: int) -> int:
+    # Кандидаты t = t_min + k * modulus, 0 <= k < K, из интервала Хассе. Для точки P кривой
+    # условие (p + 1 - t) P = 0, для точки кручения (p + 1 + t) P = 0. Вместо поиска корня
+    # y берется точка (x r, r^2) на y^2 = x^3 + a r^2 x + b r^3, r = f(x): эта кривая
+    # изоморфна E, если r - квадрат, и кручению E иначе
+    bound = math.isqrt(4 * p)
+    t_min = -bound + (trace + bound) % modulus
+    K = (bound - t_min) // modulus + 1
+    if K == 1:
+        return p + 1 - t_min
+
+    candidates = None
+    tried = 0
+    for x in range(p):
+        rhs = (x * x * x + a * x + b) % p
+        if rhs == 0:
+            continue
+        sign = 1 if pow(rhs, (p - 1) // 2, p) == 1 else -1
+        point = (x * rhs % p, rhs * rhs % p)
+        matches = _bsgs_matches(
+            point, a * rhs * rhs % p, p, p + 1 - sign * t_min, -sign * modulus, K
+        )
+        tried += 1
+        if matches is not None:
+            candidates = matches if candidates is None else candidates & matches
+            if len(candidates) == 1:
+                return p + 1 - (t_min + candidates.pop() * modulus)
+            if not candidates:
+                break
+        if tried >= _MAX_POINTS:
+            break
+    raise RuntimeError("Не удалось однозначно определить порядок кривой.")
+
+
+def _bsgs_matches(point: tuple, a: int, p: int, base: int, step: int, K: int):
+    # Все k из [0, K), для которых (base + k step) P = 0, то есть k S = T при S = step P
+    # и T = -base P. k = c + d, где c = B + i (2B + 1), |d| <= B: шаги младенца хранят
+    # x-координаты jS, знак d определяется по y. Если порядок S не больше 2B, точка
+    # почти ничего не дает, и возвращается None
+    S = _ec_mul(step, point, a, p)
+    if S is None:
+        return None
+    B = min(math.isqrt(K // 2) + 1, _BABY_MAX)
+    baby = {}
+    for j, R in enumerate(_ec_progression(S, S, B, a, p), 1):
+        if R is None or R[0] in baby:
+            return None
+        baby[R[0]] = (j, R[1])
+
+    start = _ec_add(_ec_mul(-base, point, a, p), _ec_mul(-B, S, a, p), a, p)
+    giant = _ec_mul(-(2 * B + 1), S, a, p)
+    matches = set()
+    for i, U in enumerate(_ec_progression(start, giant, (K - 1) // (2 * B + 1) + 1, a, p)):
+        c = B + i * (2 * B + 1)
+        k = None
+        if U is None:
+            k = c
+        elif U[0] in baby:
+            j, y = baby[U[0]]
+            k = c + j if U[1] == y else c - j
+        if k is not None and 0 <= k < K:
+            matches.add(k)
+    return matches
+
+
+def _ec_add(P: tuple, Q: tuple, a: int, p: int):
+    # Сложение в аффинных координатах, None - бесконечно удаленная точка
+    if P is None:
+        return Q
+    if Q is None:
+        return P
+    x1, y1 = P
+    x2, y2 = Q
+    if x1 == x2:
+        if (y1 + y2) % p == 0:
+            return None
+        slope = (3 * x1 * x1 + a) * pow(2 * y1, -1, p) % p
+    else:
+        slope = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    x3 = (slope * slope - x1 - x2) % p
+    return x3, (slope * (x1 - x3) - y1) % p
+
+
+def _ec_add_many(points: list, Q: tuple, a: int, p: int) -> list:
+    # P + Q для всех P из points с одним обращением на всех (прием Монтгомери): обращение
+    # по модулю 256-битного p стоит как пара сотен умножений. Особые случаи (бесконечно
+    # удаленная точка, P = +-Q) складываются по одной
+    if Q is None:
+        return list(points)
+    x2, y2 = Q
+    prefix = []
+    product = 1
+    for P in points:
+        if P is not None and P[0] != x2:
+            product = product * (P[0] - x2) % p
+        prefix.append(product)
+    inverse = pow(product, -1, p)
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        P = points[i]
+        if P is None or P[0] == x2:
+            result[i] = _ec_add(P, Q, a, p)
+            continue
+        x1, y1 = P
+        slope = (y1 - y2) * inverse * (prefix[i - 1] if i else 1) % p
+        inverse = inverse * (x1 - x2) % p
+        x3 = (slope * slope - x1 - x2) % p
+        result[i] = (x3, (slope * (x1 - x3) - y1) % p)
+    return result
+
+
+def _ec_progression(start: tuple, step: tuple, count: int, a: int, p: int) -> Iterator[tuple]:
+    # start + i step для 0 <= i < count. Точки идут строками по _LANES штук: следующая
+    # строка - это предыдущая плюс _LANES step, и сложения строки делят одно обращение
+    lanes = [start]
+    while len(lanes) < min(count, _LANES):
+        lanes.append(_ec_add(lanes[-1], step, a, p))
+    stride = _ec_mul(len(lanes), step, a, p)
+    while True:
+        for P in lanes:
+            if count == 0:
+                return
+            yield P
+            count -= 1
+        lanes = _ec_add_many(lanes, stride, a, p)
+
+
+def _ec_mul(k: int, P: tuple, a: int, p: int):
+    if k < 0:
+        k = -k
+        P = None if P is None else (P[0], -P[1] % p)
+    result = None
+    for bit in bin(k)[2:]:
+        result = _ec_add(result, result, a, p)
+        if bit == "1":
+            result = _ec_add(result, P, a, p)
+    return result
+
+
+def _jacobian_double(ring: "_PolyRing", a: list[int], P: tuple) -> tuple:
+    X, Y, Z = P
+    XX = ring.sqr(X)
+    YY = ring.sqr(Y)
+    ZZ = ring.sqr(Z)
+    S = ring.scale(ring.mul(X, YY), 4)
+    M = ring.add(ring.scale(XX, 3), ring.mul(a, ring.sqr(ZZ)))
+    X3 = ring.sub(ring.sqr(M), ring.scale(S, 2))
+    Y3 = ring.sub(ring.mul(M, ring.sub(S, X3)), ring.scale(ring.sqr(YY), 8))
+    return X3, Y3, ring.scale(ring.mul(Y, Z), 2)
+
+
+def _jacobian_add_affine(ring: "_PolyRing", P: tuple, Q: tuple) -> tuple:
+    X1, Y1, Z1 = P
+    x2, y2 = Q
+    Z1Z1 = ring.sqr(Z1)
+    H = ring.sub(ring.mul(x2, Z1Z1), X1)
+    r = ring.sub(ring.mul(y2, ring.mul(Z1, Z1Z1)), Y1)
+    HH = ring.sqr(H)
+    HHH = ring.mul(H, HH)
+    V = ring.mul(X1, HH)
+    X3 = ring.sub(ring.sub(ring.sqr(r), HHH), ring.scale(V, 2))
+    Y3 = ring.sub(ring.mul(r, ring.sub(V, X3)), ring.mul(Y1, HHH))
+    return X3, Y3, ring.mul(Z1, H)
+
+
+def _jacobian_mul(ring: "_PolyRing", a: list[int], point: tuple, k: int) -> tuple:
+    # 1 <= k < l: все промежуточные кратные ненулевые и различны, поэтому формулы
+    # сложения и удвоения не вырождаются ни в одной точке l-кручения
+    R = (point[0], point[1], [1])
+    for bit in bin(k)[3:]:
+        R = _jacobian_double(ring, a, R)
+        if bit == "1":
+            R = _jacobian_add_affine(ring, R, point)
+    return R
+
+
+class _PolyRing:
+    """
+    Кольцо F_p[x] / (h) для унитарного h степени n. Элементы - списки коэффициентов
+    от младшего к старшему длины не больше n. Остаток от деления на h считается
+    по Барретту двумя умножениями с заранее найденным обратным к перевернутому h
+    """
+
+    def __init__(self, h: list[int], p: int):
+        self.h = h
+        self.n = len(h) - 1
+        self.p = p
+        self._inverse = _series_inverse(h[::-1], self.n, p)
+
+    def reduce(self, c: list[int]) -> list[int]:
+        n, p = self.n, self.p
+        if len(c) <= n:
+            return c
+        high = c[n:]
+        quotient = _poly_mul(high[::-1], self._inverse[:len(high)], p, len(high))[::-1]
+        return [(x - y) % p for x, y in zip(c, _poly_mul(quotient, self.h, p, n))]
+
+    def mul(self, u: list[int], v: list[int]) -> list[int]:
+        return self.reduce(_poly_mul(u, v, self.p))
+
+    def sqr(self, u: list[int]) -> list[int]:
+        return self.reduce(_poly_mul(u, u, self.p))
+
+    def add(self, u: list[int], v: list[int]) -> list[int]:
+        return _poly_add(u, v, self.p)
+
+    def sub(self, u: list[int], v: list[int]) -> list[int]:
+        return _poly_sub(u, v, self.p)
+
+    def neg(self, u: list[int]) -> list[int]:
+        return [-c % self.p for c in u]
+
+    def scale(self, u: list[int], k: int) -> list[int]:
+        return [c * k % self.p for c in u]
+
+    def equal(self, u: list[int], v: list[int]) -> bool:
+        return not _trim(_poly_sub(u, v, self.p))
+
+    def pow(self, u: list[int], e: int) -> list[int]:
+        # Скользящее окно до 4 бит по нечетным степеням u, u^3, ..., u^15
+        u = self.reduce(u)
+        u2 = self.sqr(u)
+        odd = [u]
+        for _ in range(7):
+            odd.append(self.mul(odd[-1], u2))
+        bits = bin(e)[2:]
+        result = [1]
+        i = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                result = self.sqr(result)
+                i += 1
+                continue
+            j = min(i + 4, len(bits))
+            while bits[j - 1] == "0":
+                j -= 1
+            for _ in range(j - i):
+                result = self.sqr(result)
+            result = self.mul(result, odd[int(bits[i:j], 2) >> 1])
+            i = j
+        return result
+
+    def compose(self, polys: list[list[int]], t: list[int]) -> list[list[int]]:
+        """
+        g(t) mod h для каждого g из polys по схеме Брента-Куна: степени t^0, ..., t^k
+        при k ~ sqrt(n) считаются один раз, блоки по k коэффициентов g собираются
+        линейными комбинациями этих степеней, а блоки - схемой Горнера по t^k.
+        Вместо deg g умножений в кольце нужно около 2 sqrt(n)
+
+        :return: Список g(t) mod h в порядке polys
+        """
+        p = self.p
+        k = math.isqrt(self.n) + 1
+        powers = [[1], t]
+        while len(powers) <= k:
+            powers.append(self.mul(powers[-1], t))
+        step = powers.pop()
+        # Линейные комбинации степеней складываются в одном длинном числе: в ячейку
+        # шириной width байт помещается сумма k произведений коэффициентов
+        width = (k * (p - 1) ** 2).bit_length() // 8 + 1
+        packed = [_pack(u, width) for u in powers]
+        results = []
+        for g in polys:
+            result = []
+            for start in reversed(range(0, len(g), k)):
+                block = sum(c * value for c, value in zip(g[start:start + k], packed))
+                block = _unpack(block, width, self.n, p)
+                result = self.add(self.mul(result, step), block) if result else block
+            results.append(result)
+        return results
+
+
+def _series_inverse(f: list[int], length: int, p: int) -> list[int]:
+    # Обратный к f ряд по модулю x^length итерацией Ньютона g <- g (2 - f g)
+    g = [pow(f[0], -1, p)]
+    k = 1
+    while k < length:
+        k = min(2 * k, length)
+        e = [-c % p for c in _poly_mul(f[:k], g, p, k)]
+        e[0] = (e[0] + 2) % p
+        g = _poly_mul(g, e, p, k)
+    return g
+
+
+def _poly_mul(u: list[int], v: list[int], p: int, length: int = None) -> list[int]:
+    # Произведение подстановкой Кронекера: коэффициенты укладываются в ячейки одного
+    # длинного числа с запасом под сумму произведений, числа перемножаются, и ячейки
+    # результата читаются обратно. Возвращаются length младших коэффициентов
+    if not u or not v:
+        return []
+    size = len(u) + len(v) - 1
+    length = size if length is None else min(length, size)
+    bound = min(len(u), len(v)) * (p - 1) ** 2
+    if min(len(u), len(v)) < _DECIMAL_MIN_LEN:
+        width = bound.bit_length() // 8 + 1
+        packed = _pack(u, width)
+        product = packed * (packed if v is u else _pack(v, width))
+        return _unpack(product, width, length, p)
+
+    width = len(str(bound))
+    packed = _pack_decimal(u, width)
+    product = _DECIMAL.multiply(packed, packed if v is u else _pack_decimal(v, width))
+    digits = str(product).zfill(length * width)
+    end = len(digits)
+    return [int(digits[end - (i + 1) * width:end - i * width]) % p for i in range(length)]
+
+
+def _pack(u: list[int], width: int) -> int:
+    return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in u), "little")
+
+
+def _unpack(value: int, width: int, length: int, p: int) -> list[int]:
+    data = (value & ((1 << (8 * width * length)) - 1)).to_bytes(width * length, "little")
+    return [int.from_bytes(data[i:i + width], "little") % p for i in range(0, width * length, width)]
+
+
+def _pack_decimal(u: list[int], width: int) -> decimal.Decimal:
+    return decimal.Decimal("".join(f"{c:0{width}d}" for c in reversed(u)))
+
+
+def _poly_add(u: list[int], v: list[int], p: int) -> list[int]:
+    if len(u) < len(v):
+        u, v = v, u
+    return [(x + y) % p for x, y in zip(u, v)] + u[len(v):]
+
+
+def _poly_sub(u: list[int], v: list[int], p: int) -> list[int]:
+    if len(u) >= len(v):
+        return [(x - y) % p for x, y in zip(u, v)] + u[len(v):]
+    return [(x - y) % p for x, y in zip(u, v)] + [-y % p for y in v[len(u):]]
+
+
+def _trim(u: list[int]) -> list[int]:
+    end = len(u)
+    while end and u[end - 1] == 0:
+        end -= 1
+    return u[:end]
+
+
+def _poly_rem(u: list[int], v: list[int], p: int) -> list[int]:
+    u = _trim(u)
+    v = _trim(v)
+    dv = len(v) - 1
+    inverse = pow(v[-1], -1, p)
+    for i in range(len(u) - 1, dv - 1, -1):
+        c = u[i] * inverse % p
+        if c:
+            start = i - dv
+            u[start:i + 1] = [(x - c * y) % p for x, y in zip(u[start:i + 1], v)]
+    return _trim(u[:dv])
+
+
+def _poly_gcd(u: list[int], v: list[int], p: int) -> list[int]:
+    # Унитарный НОД алгоритмом Евклида; [1] для взаимно простых
+    u, v = _trim(u), _trim(v)
+    while v:
+        u, v = v, _poly_rem(u, v, p)
+    inverse = pow(u[-1], -1, p)
+    return [c * inverse % p for c in u]
+
+
+_METHODS = {"naive": count_naive, "bsgs": count_bsgs, "schoof": count_schoof}
@@ -0,0 +1,103 @@
+import numpy as np
+
+# Сколько значений x обрабатывается за один проход, чтобы временные массивы
+# не разрастались при p в десятки миллионов
+_CHUNK_X = 1 << 20
+# Корни хранятся в int32, а произведения x * x считаются в int64 без переполнения
+MAX_P = 1 << 31
+
+
+def sqrt_table(p: int) -> np.ndarray:
+    """
+    Таблица квадратных корней по модулю p: table[r] - корень y <= p / 2 из r
+    или -1, если r не квадратичный вычет
+
+    :param: p: Простой модуль, p < MAX_P
+    :return: Массив int32 длины p
+    """
+    if not 2 <= p < MAX_P:
+        raise ValueError(f"Модуль должен быть от 2 до {MAX_P - 1}")
+    ys = np.arange(p // 2 + 1, dtype=np.int64)
+    table = np.full(p, -1, dtype=np.int32)
+    table[ys * ys % p] = ys
+    return table
+
+
+class PointEnumerator:
+    """
+    Векторизованный перебор точек кривой y^2 = x^3 + ax + b (mod p).
+
+    Один раз строится таблица y^2 -> y для всех вычетов, после чего правая часть
+    x^3 + ax + b считается сразу для блока x, а корни берутся из таблицы без
+    возведения в степень и алгоритма Тонелли-Шанкса. Точки выдаются двумя
+    массивами координат в порядке возрастания x; для каждого x сначала идет
+    меньший корень y, затем p - y.
+    """
+
+    def __init__(self, a: int, b: int, p: int, chunk: int = _CHUNK_X):
+        self.a = a % p
+        self.b = b % p
+        self.p = p
+        self.chunk = chunk
+        self.table = sqrt_table(p)
+
+    def arrays(self, x_start: int = 0, x_stop: int = None, limit: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Все аффинные точки с x_start <= x < x_stop
+
+        :param: limit: Остановиться, набрав не меньше limit точек; точки с одним x не разделяются
+        :return: (xs, ys): Массивы int64 одинаковой длины
+        """
+        x_stop = self.p if x_stop is None else min(x_stop, self.p)
+        parts = []
+        total = 0
+        for start in range(x_start, x_stop, self.chunk):
+            xs, ys = self._chunk(start, min(start + self.chunk, x_stop))
+            parts.append((xs, ys))
+            total += len(xs)
+            if limit is not None and total >= limit:
+                break
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        xs = np.concatenate([xs for xs, _ in parts])
+        ys = np.concatenate([ys for _, ys in parts])
+        if limit is not None and len(xs) >= limit:
+            # Как и в цикле по x: останавливаемся на том x, где набрали limit точек
+            last_x = xs[limit - 1] if limit > 0 else x_start
+            cut = int(np.searchsorted(xs, last_x, side="right"))
+            xs, ys = xs[:cut], ys[:cut]
+        return xs, ys
+
+    def count(self) -> int:
+        """
+        :return: Число точек кривой вместе с бесконечно удаленной
+        """
+        total = 1
+        for start in range(0, self.p, self.chunk):
+            roots = self._roots(np.arange(start, min(start + self.chunk, self.p), dtype=np.int64))
+            total += int(np.count_nonzero(roots >= 0)) + int(np.count_nonzero(self._has_pair(roots)))
+        return total
+
+    def _roots(self, x: np.ndarray) -> np.ndarray:
+        p = self.p
+        rhs = (x * x % p * x + self.a * x % p + self.b) % p
+        return self.table[rhs].astype(np.int64)
+
+    def _has_pair(self, roots: np.ndarray) -> np.ndarray:
+        # Второй корень p - y отличен от y, если y != 0 (и y != p / 2 при p = 2)
+        return (roots > 0) & (2 * roots != self.p)
+
+    def _chunk(self, x_start: int, x_stop: int) -> tuple[np.ndarray, np.ndarray]:
+        x = np.arange(x_start, x_stop, dtype=np.int64)
+        roots = self._roots(x)
+        found = roots >= 0
+        x, roots = x[found], roots[found]
+        pair = self._has_pair(roots)
+
+        counts = 1 + pair
+        starts = np.cumsum(counts) - counts
+        xs = np.repeat(x, counts)
+        ys = np.empty(len(xs), dtype=np.int64)
+        ys[starts] = roots
+        ys[starts[pair] + 1] = self.p - roots[pair]
+        return xs, ys
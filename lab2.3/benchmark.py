@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from gost341112 import GOST341112, HMACGOST341112, pbkdf2
+
+# Контрольные примеры ГОСТ 34.11-2012, приложение А (сообщения M1 и M2), записанные
+# строкой байт, как в Р 50.1.113-2016: младший байт вектора идет первым.
+# Остальные сообщения покрывают несколько блоков и длины, кратные 64 байтам,
+# для которых к сообщению добавляется отдельный блок дополнения
+TEST_VECTORS = [
+    (
+        "M1",
+        b"012345678901234567890123456789012345678901234567890123456789012",
+        {
+            512: "1b54d01a4af5b9d5cc3d86d68d285462b19abc2475222f35c085122be4ba1ffa"
+                 "00ad30f8767b3a82384c6574f024c311e2a481332b08ef7f41797891c1646f48",
+            256: "9d151eefd8590b89daa6ba6cb74af9275dd051026bb149a452fd84e5e57b5500",
+        },
+    ),
+    (
+        "M2",
+        bytes.fromhex(
+            "d1e520e2e5f2f0e82c20d1f2f0e8e1eee6e820e2edf3f6e82c20e2e5fef2fa20f120ecee"
+            "f0ff20f1f2f0e5ebe0ece820ede020f5f0e0e1f0fbff20efebfaeafb20c8e3eef0e5e2fb"
+        ),
+        {
+            512: "1e88e62226bfca6f9994f1f2d51569e0daf8475a3b0fe61a5300eee46d961376"
+                 "035fe83549ada2b8620fcd7c496ce5b33f0cb9dddc2b6460143b03dabac9fb28",
+            256: "9dd2fe4e90409e5da87f53976d7405b0c0cac628fc669a741d50063c557e8f50",
+        },
+    ),
+    (
+        "empty",
+        b"",
+        {
+            512: "8e945da209aa869f0455928529bcae4679e9873ab707b55315f56ceb98bef0a7"
+                 "362f715528356ee83cda5f2aac4c6ad2ba3a715c1bcd81cb8e9f90bf4c1c1a8a",
+            256: "3f539a213e97c802cc229d474c6aa32a825a360b2a933a949fd925208d9ce1bb",
+        },
+    ),
+    (
+        "64",
+        bytes(range(64)),
+        {
+            512: "2ae581f18ae85e3596c936acbef910f2ed70dcf91ed5d24b39a5af657bf8232a"
+                 "303d686056c8c00bf30d42e16ce255426fa8a155dcb3eb822d925808f7c7e345",
+            256: "1bce2366e4aecd63c75f972bfc6a514e03e2125920bea5b59cbd8ce0be56b8f3",
+        },
+    ),
+    (
+        "128",
+        bytes(range(128)),
+        {
+            512: "a8d65e689c89d8cd4616215d14ebfc02993bde3f5c7d7219904d87848ce9249e"
+                 "7ce3525ae605d85a3596457c880f938eead974b91f61203d31665ca6f3a1decc",
+            256: "927285165104e5587233772ce496d96bf108c942f4399986a6bc8e908e9622a4",
+        },
+    ),
+    (
+        "129",
+        bytes(range(129)),
+        {
+            512: "0795d73cff90abe21486ecf09de3684352c2a54357853cef85f695dcf7ed6640"
+                 "ff319639c712e3fa4e10e33547fd4b08cbdaa21e0d35a7001e24fb8b78ac0bbb",
+            256: "7373f7d09afe51640d2dfdb9a2d8bd293455340c35f252906503170eb3e6a37d",
+        },
+    ),
+    (
+        "200",
+        bytes(range(200)),
+        {
+            512: "43946b2e8d58cb727df9affa1fffa19884aec42156f0933138aef821a9a8809e"
+                 "ad7d39c061f85734f5e97b52e99d4813b71d04d2f39f838ae7a6bd256d03fa04",
+            256: "c3c662d736c446b1e2937e9c4a13e4b0e1c6981cf267f46db2a163d86f716300",
+        },
+    ),
+    (
+        "1000",
+        bytes(i % 256 for i in range(1000)),
+        {
+            512: "36361fda766623085b4669b28143bc8e9df65066d806a3fe15dfc66ccef7ea00"
+                 "f3aa06823279616e601c53f0f10a7bcbc70de55334c6242e520365c886175586",
+            256: "ac699d1a5e14913174e6361b8c50a683f74a763290d0864f0fe7768f4a431b5f",
+        },
+    ),
+]
+
+# Р 50.1.113-2016, приложение А: ключ 00..1f и сообщение T
+HMAC_VECTORS = [
+    (
+        256,
+        bytes(range(32)),
+        bytes.fromhex("0126bdb87800af214341456563780100"),
+        "a1aa5f7de402d7b3d323f2991c8d4534013137010a83754fd0af6d7cd4922ed9",
+    ),
+    (
+        512,
+        bytes(range(32)),
+        bytes.fromhex("0126bdb87800af214341456563780100"),
+        "a59bab22ecae19c65fbde6e5f4e9f5d8549d31f037f9df9b905500e171923a77"
+        "3d5f1530f2ed7e964cb2eedc29e9ad2f3afe93b2814f79f5000ffc0366c251e6",
+    ),
+]
+
+# Р 50.1.111-2016, приложение А: P = "password", S = "salt", dkLen = 64
+PBKDF2_VECTORS = [
+    (
+        1,
+        "64770af7f748c3b1c9ac831dbcfd85c26111b30a8a657ddc3056b80ca73e040d"
+        "2854fd36811f6d825cc4ab66ec0a68a490a9e5cf5156b3a2b7eecddbf9a16b47",
+    ),
+    (
+        2,
+        "5a585bafdfbb6e8830d6d68aa3b43ac00d2e4aebce01c9b31c2caed56f0236d4"
+        "d34b2b8fbd2c4e89d54d46f50e47d45bbac301571743119e8d3c42ba66d348de",
+    ),
+    (
+        4096,
+        "e52deb9a2d2aaff4e2ac9d47a41f34c20376591c67807f0477e32549dc341bc7"
+        "867c09841b6d58e29d0347c996301d55df0d34e47cf68f4e3c2cdaf1d9ab86c3",
+    ),
+]
+
+DEFAULT_SIZES = [0, 64, 1024, 64 * 1024, 1024 * 1024]
+FULL_SIZES = DEFAULT_SIZES + [10 * 1024 * 1024, 100 * 1024 * 1024]
+_FEED_CHUNK = 1024 * 1024
+
+
+def check_vectors() -> list[str]:
+    failures = []
+    for name, message, expected in TEST_VECTORS:
+        for hash_size, digest in expected.items():
+            hasher = GOST341112(hash_size=hash_size)
+            actual = hasher.hash(message).hex()
+            if actual != digest:
+                failures.append(f"{name}/{hash_size}: ожидалось {digest}, получено {actual}")
+            # Тот же результат должен получаться при подаче сообщения по одному байту
+            h = hasher.new()
+            for i in range(len(message)):
+                h.update(message[i:i + 1])
+            if h.hexdigest() != digest:
+                failures.append(f"{name}/{hash_size} (потоково): ожидалось {digest}, получено {h.hexdigest()}")
+
+    for hash_size, key, message, digest in HMAC_VECTORS:
+        actual = HMACGOST341112(key, hash_size=hash_size).hexdigest(message)
+        if actual != digest:
+            failures.append(f"HMAC/{hash_size}: ожидалось {digest}, получено {actual}")
+
+    for iterations, derived in PBKDF2_VECTORS:
+        actual = pbkdf2(b"password", b"salt", iterations).hex()
+        if actual != derived:
+            failures.append(f"PBKDF2/{iterations}: ожидалось {derived}, получено {actual}")
+    return failures
+
+
+def measure_throughput(hasher: GOST341112, size: int, min_time: float) -> float:
+    """
+    Возвращает скорость хэширования сообщения длины size в байтах в секунду.
+    Большие сообщения подаются потоком из одного буфера, чтобы не держать их в памяти.
+    """
+    chunk = os.urandom(min(size, _FEED_CHUNK))
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        h = hasher.new(length=size)
+        fed = 0
+        while fed < size:
+            part = chunk[:size - fed]
+            h.update(part)
+            fed += len(part)
+        h.digest()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return size * runs / elapsed
+
+
+def measure_calls(hasher: GOST341112, size: int, min_time: float) -> float:
+    message = os.urandom(size)
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        for _ in range(100):
+            hasher.hash(message)
+        runs += 100
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return runs / elapsed
+
+
+def run(sizes: list[int], hash_sizes: list[int], min_time: float, repeat: int = 3) -> dict:
+    """
+    Каждый замер повторяется repeat раз и берется лучший результат,
+    чтобы сравнение с базовой линией меньше зависело от фоновой нагрузки.
+    """
+    results = {}
+    for hash_size in hash_sizes:
+        hasher = GOST341112(hash_size=hash_size)
+        results[f"calls_per_sec/{hash_size}/32"] = max(
+            measure_calls(hasher, 32, min_time) for _ in range(repeat)
+        )
+        for size in sizes:
+            if size == 0:
+                # У пустого сообщения скорость в байтах не определена, меряется число вызовов
+                results[f"calls_per_sec/{hash_size}/0"] = max(
+                    measure_calls(hasher, 0, min_time) for _ in range(repeat)
+                )
+                continue
+            results[f"bytes_per_sec/{hash_size}/{size}"] = max(
+                measure_throughput(hasher, size, min_time) for _ in range(repeat)
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for key, value in results.items():
+        if key in baseline and value < baseline[key] * (1 - tolerance):
+            regressions.append(f"{key}: {value:.1f} против {baseline[key]:.1f} в базовой линии")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверка и бенчмарк ГОСТ 34.11-2012")
+    parser.add_argument('--full', action='store_true', help="Размеры сообщений вплоть до 100 МБ")
+    parser.add_argument('--size', type=int, choices=(256, 512), action='append', help="Размер хэша (можно несколько)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Минимальное время одного замера, с")
+    parser.add_argument('--repeat', type=int, default=3, help="Число повторов каждого замера")
+    parser.add_argument('--baseline', default=str(Path(__file__).with_name('benchmark_baseline.json')))
+    parser.add_argument('--save', action='store_true', help="Сохранить результаты как базовую линию")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Допустимое замедление относительно базовой линии")
+    args = parser.parse_args(argv)
+
+    failures = check_vectors()
+    for failure in failures:
+        print(f"KAT FAILED {failure}")
+    if failures:
+        return 1
+    print("Контрольные примеры хэша, HMAC и PBKDF2: OK")
+
+    results = run(FULL_SIZES if args.full else DEFAULT_SIZES, args.size or [256, 512], args.min_time, args.repeat)
+    for key, value in results.items():
+        print(f"{key:32} {value:14.1f}")
+
+    baseline_path = Path(args.baseline)
+    if args.save:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Базовая линия сохранена в {baseline_path}")
+        return 0
+
+    if baseline_path.exists():
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
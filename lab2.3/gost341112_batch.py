@@ -0,0 +1,123 @@
+import numpy as np
+
+from gost341112 import GOST341112
+
+# Сколько сообщений сжимается за один проход, чтобы временные массивы LPS
+# (64 слова uint64 на сообщение) не разрастались на миллионах записей
+_CHUNK_ROWS = 65536
+_K_INDEX = np.arange(8)[None, :, None]
+
+
+class GOST341112Batch:
+    """
+    Векторизованный ГОСТ 34.11-2012 для множества независимых сообщений.
+
+    Состояние каждого сообщения хранится строкой из восьми uint64-слов
+    (старшее слово первым), а LPS выполняется табличными подстановками
+    сразу для всех строк. Результат побайтно совпадает с GOST341112.hash.
+    """
+
+    def __init__(self, hash_size=512):
+        self.hasher = GOST341112(hash_size=hash_size)
+        self.hash_size = hash_size
+        self.digest_size = hash_size // 8
+        self.tables = np.array(self.hasher.lps_tables, dtype=np.uint64)
+        self.constants = [self._int_to_words(c) for c in self.hasher.int_constants]
+        self.iv = self._int_to_words(int.from_bytes(self.hasher._get_iv(), byteorder='big'))
+
+    @staticmethod
+    def _int_to_words(value: int) -> np.ndarray:
+        return np.frombuffer(value.to_bytes(64, byteorder='big'), dtype='>u8').astype(np.uint64)
+
+    @staticmethod
+    def _blocks_to_words(blocks: np.ndarray) -> np.ndarray:
+        # Блок сообщения - число в порядке little-endian, поэтому байты
+        # разворачиваются перед разбиением на слова со старшего
+        return np.ascontiguousarray(blocks[:, ::-1]).view('>u8').astype(np.uint64)
+
+    def _lps(self, state: np.ndarray) -> np.ndarray:
+        # b[:, k, i] - i-й (от старшего) байт k-го слова, выходное слово i
+        # собирается XOR-ом T[k][b[:, k, i]] по всем k
+        b = state.astype('<u8', copy=False).view(np.uint8).reshape(-1, 8, 8)[:, :, ::-1]
+        return np.bitwise_xor.reduce(self.tables[_K_INDEX, b], axis=1)
+
+    def _g(self, N: np.ndarray, h: np.ndarray, m: np.ndarray) -> np.ndarray:
+        lps = self._lps
+        K = lps(h ^ N)
+        state = m
+        for c in self.constants:
+            state = lps(state ^ K)
+            K = lps(K ^ c)
+        return state ^ K ^ h ^ m
+
+    @staticmethod
+    def _add512(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        result = np.empty_like(a)
+        carry = np.zeros(a.shape[0], dtype=np.uint64)
+        for i in range(7, -1, -1):
+            s = a[:, i] + b[:, i]
+            c1 = s < a[:, i]
+            s2 = s + carry
+            carry = (c1 | (s2 < s)).astype(np.uint64)
+            result[:, i] = s2
+        return result
+
+    def _hash_equal_length(self, data: np.ndarray) -> np.ndarray:
+        count, length = data.shape
+        h = np.broadcast_to(self.iv, (count, 8)).copy()
+        Sigma = np.zeros((count, 8), dtype=np.uint64)
+        N = 0
+
+        full = length - length % 64
+        for i in range(0, full, 64):
+            block = self._blocks_to_words(data[:, i:i + 64])
+            h = self._g(self._int_to_words(N), h, block)
+            N = N + 512
+            Sigma = self._add512(Sigma, block)
+
+        tail = length - full
+        padded = np.zeros((count, 64), dtype=np.uint8)
+        padded[:, :tail] = data[:, full:]
+        padded[:, tail] = 0x01
+        block = self._blocks_to_words(padded)
+        h = self._g(self._int_to_words(N), h, block)
+
+        N = N + tail * 8
+        Sigma = self._add512(Sigma, block)
+
+        zero = np.zeros(8, dtype=np.uint64)
+        h = self._g(zero, self._g(zero, h, self._int_to_words(N)), Sigma)
+        digest = h.astype('>u8').view(np.uint8).reshape(count, 64)[:, ::-1]
+        return np.ascontiguousarray(digest[:, 64 - self.digest_size:])
+
+    def hash_array(self, data: np.ndarray) -> np.ndarray:
+        """
+        Хэширует строки двумерного массива uint8 одинаковой длины.
+
+        :param: data: Массив формы (n, L)
+        :return: Массив дайджестов формы (n, hash_size // 8)
+        """
+        data = np.asarray(data, dtype=np.uint8)
+        if data.ndim != 2:
+            raise ValueError("Ожидается двумерный массив сообщений")
+        result = np.empty((data.shape[0], self.digest_size), dtype=np.uint8)
+        for start in range(0, data.shape[0], _CHUNK_ROWS):
+            result[start:start + _CHUNK_ROWS] = self._hash_equal_length(data[start:start + _CHUNK_ROWS])
+        return result
+
+    def hash_many(self, messages: list[bytes]) -> np.ndarray:
+        """
+        Хэширует список сообщений произвольной длины, группируя их по длине.
+
+        :param: messages: Список сообщений в байтах
+        :return: Массив дайджестов формы (n, hash_size // 8) в исходном порядке
+        """
+        groups: dict[int, list[int]] = {}
+        for index, message in enumerate(messages):
+            groups.setdefault(len(message), []).append(index)
+
+        result = np.empty((len(messages), self.digest_size), dtype=np.uint8)
+        for length, indices in groups.items():
+            data = np.frombuffer(b''.join(messages[i] for i in indices), dtype=np.uint8)
+            result[indices] = self.hash_array(data.reshape(len(indices), length))
+        return result
@@ -0,0 +1,157 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from gost341112 import GOST341112, hash_file
+
+_worker_hasher = None
+_HEADER_PREFIX = '# streebog'
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+    hash_size: int
+
+    def to_line(self) -> str:
+        return f"{self.digest}  {self.size}  {self.mtime_ns}  {self.path}"
+
+    @classmethod
+    def from_line(cls, line: str, hash_size: int = None) -> "ManifestEntry":
+        digest, size, mtime_ns, path = line.rstrip('\n').split('  ', 3)
+        # Манифесты без заголовка с размером хэша: размер следует из длины дайджеста
+        return cls(path, int(size), int(mtime_ns), digest, hash_size or len(digest) * 4)
+
+
+def read_manifest(path) -> dict[str, ManifestEntry]:
+    entries = {}
+    hash_size = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(_HEADER_PREFIX):
+                hash_size = int(line[len(_HEADER_PREFIX):])
+            elif line.strip():
+                entry = ManifestEntry.from_line(line, hash_size)
+                entries[entry.path] = entry
+    return entries
+
+
+def write_manifest(path, entries: list[ManifestEntry], hash_size=512):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(f"{_HEADER_PREFIX}{hash_size}\n")
+        for entry in sorted(entries, key=lambda e: e.path):
+            f.write(entry.to_line() + '\n')
+    os.replace(tmp, path)
+
+
+def _init_worker(hash_size: int):
+    global _worker_hasher
+    _worker_hasher = GOST341112(hash_size=hash_size)
+
+
+def _hash_worker(path: str) -> str:
+    return hash_file(_worker_hasher, path).hex()
+
+
+def _scan(root: Path, exclude=()) -> list[tuple[str, os.stat_result]]:
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            full = Path(dirpath) / name
+            if not full.is_file() or full.resolve() in exclude:
+                continue
+            files.append((full.relative_to(root).as_posix(), full.stat()))
+    return files
+
+
+def hash_tree(root, hash_size=512, jobs=None, previous: dict[str, ManifestEntry] = None, exclude=()):
+    """
+    Хэширует все файлы каталога в пуле процессов.
+
+    Крупные файлы отправляются первыми, чтобы хвост очереди состоял из мелких
+    задач и процессы заканчивали работу примерно одновременно. Файлы, у которых
+    размер, mtime и размер хэша совпадают с записью из previous, повторно
+    не хэшируются.
+
+    :return: (entries, rehashed): Записи манифеста и список перехэшированных путей
+    """
+    root = Path(root)
+    previous = previous or {}
+    entries = []
+    pending = []
+
+    for rel, st in _scan(root, exclude):
+        old = previous.get(rel)
+        if old is not None and (old.size, old.mtime_ns, old.hash_size) == (st.st_size, st.st_mtime_ns, hash_size):
+            entries.append(old)
+        else:
+            pending.append((rel, st))
+
+    pending.sort(key=lambda item: item[1].st_size, reverse=True)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(hash_size,)) as pool:
+            futures = {pool.submit(_hash_worker, str(root / rel)): (rel, st) for rel, st in pending}
+            for future in as_completed(futures):
+                rel, st = futures[future]
+                entries.append(ManifestEntry(rel, st.st_size, st.st_mtime_ns, future.result(), hash_size))
+
+    return entries, [rel for rel, _ in pending]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Манифест хэшей ГОСТ 34.11-2012 для дерева каталогов")
+    parser.add_argument('root', help="Корневой каталог")
+    parser.add_argument('-o', '--output', default='MANIFEST.hash', help="Файл манифеста")
+    parser.add_argument('--size', type=int, choices=(256, 512), default=None,
+                        help="Размер хэша в битах (по умолчанию как в прошлом манифесте, иначе 512)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Число процессов (по умолчанию все ядра)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Пропускать файлы с неизменными размером и mtime из прошлого манифеста")
+    parser.add_argument('--verify', action='store_true',
+                        help="Только сверить дерево с манифестом, не перезаписывая его")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    previous = {}
+    if (args.incremental or args.verify) and output.exists():
+        previous = read_manifest(output)
+    elif args.verify:
+        parser.error(f"манифест {output} не найден")
+    hash_size = args.size or next((entry.hash_size for entry in previous.values()), 512)
+
+    entries, rehashed = hash_tree(
+        args.root, hash_size, args.jobs, previous if args.incremental else None,
+        exclude={output.resolve(), Path(f"{output}.tmp").resolve()}
+    )
+    if not args.verify:
+        write_manifest(output, entries, hash_size)
+
+    current = {entry.path: entry for entry in entries}
+    added = [rel for rel in sorted(rehashed) if rel not in previous]
+    changed = [
+        rel for rel in sorted(rehashed)
+        if rel in previous and previous[rel].hash_size == hash_size and previous[rel].digest != current[rel].digest
+    ]
+    removed = sorted(previous.keys() - current)
+    for rel in added:
+        print(f"добавлен: {rel}")
+    for rel in changed:
+        print(f"изменён: {rel}")
+    for rel in removed:
+        print(f"удалён: {rel}")
+    print(f"Файлов: {len(entries)}, перехэшировано: {len(rehashed)}", file=sys.stderr)
+
+    # При сверке лишний файл - такое же расхождение с манифестом, как изменённый
+    return 1 if changed or removed or (args.verify and added) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
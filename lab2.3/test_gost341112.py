@@ -0,0 +1,72 @@
+import io
+import mmap
+
+import pytest
+
+from benchmark import HMAC_VECTORS, PBKDF2_VECTORS, TEST_VECTORS
+from gost341112 import GOST341112, HMACGOST341112, hash_fileobj, main, pbkdf2
+
+
+@pytest.mark.parametrize("name, message, expected", TEST_VECTORS, ids=[v[0] for v in TEST_VECTORS])
+def test_hash_vectors(name, message, expected):
+    for hash_size, digest in expected.items():
+        hasher = GOST341112(hash_size=hash_size)
+        assert hasher.hash(message).hex() == digest
+        h = hasher.new()
+        for i in range(0, len(message), 7):
+            h.update(message[i:i + 7])
+        assert h.hexdigest() == digest
+
+
+@pytest.mark.parametrize("hash_size, key, message, expected", HMAC_VECTORS)
+def test_hmac_r_50_1_113(hash_size, key, message, expected):
+    hmac = HMACGOST341112(key, hash_size=hash_size)
+    assert hmac.hexdigest(message) == expected
+    # Сохраненное состояние после ключа не должно портиться от предыдущих сообщений
+    assert hmac.hexdigest(message) == expected
+
+    h = hmac.new()
+    h.update(message[:5])
+    h.update(message[5:])
+    assert h.hexdigest() == expected
+
+
+@pytest.mark.parametrize("iterations, expected", PBKDF2_VECTORS)
+def test_pbkdf2_r_50_1_111(iterations, expected):
+    assert pbkdf2(b"password", b"salt", iterations).hex() == expected
+
+
+def test_hash_fileobj_from_current_position(tmp_path):
+    data = bytes(i % 251 for i in range(3 * mmap.PAGESIZE + 100))
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    hasher = GOST341112()
+    expected = hasher.hash(data[4097:])
+
+    with open(path, 'rb') as f:
+        f.read(4097)
+        assert hash_fileobj(hasher, f) == expected
+        assert f.read() == b''
+
+    stream = io.BytesIO(data)
+    stream.read(4097)
+    assert hash_fileobj(hasher, stream) == expected
+
+
+def test_cli_sidecars(tmp_path, capsys):
+    (tmp_path / "f.txt").write_bytes(b"text")
+    (tmp_path / "f.bin").write_bytes(b"binary")
+    (tmp_path / "g").write_bytes(b"no sidecar")
+    paths = [str(tmp_path / name) for name in ("f.txt", "f.bin")]
+
+    assert main(["--write", *paths]) == 0
+    assert (tmp_path / "f.txt.hash").exists() and (tmp_path / "f.bin.hash").exists()
+    assert main(["--check", *paths]) == 0
+
+    capsys.readouterr()
+    assert main(["--check", str(tmp_path / "g"), *paths]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        f"{tmp_path / 'g'}: MISSING",
+        f"{paths[0]}: OK",
+        f"{paths[1]}: OK",
+    ]
@@ -0,0 +1,47 @@
+import io
+import json
+
+from gost341112 import GOST341112
+from tree_hash import hash_leaf, main, merkle_root, prove_range, tree_hash_file, verify_range
+
+
+def test_leaves_with_unaligned_offsets(tmp_path):
+    data = bytes(i * 7 % 256 for i in range(50_000))
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    hasher = GOST341112()
+    # 10000 не кратно ALLOCATIONGRANULARITY, последний лист неполный
+    expected = [hash_leaf(hasher, data[i:i + 10_000]) for i in range(0, len(data), 10_000)]
+    assert tree_hash_file(path, leaf_size=10_000, jobs=2) == expected
+
+
+def test_range_proof(tmp_path):
+    data = bytes(i * 13 % 256 for i in range(50_000))
+    hasher = GOST341112()
+    leaves = [hash_leaf(hasher, data[i:i + 10_000]) for i in range(0, len(data), 10_000)]
+    root = merkle_root(hasher, leaves)
+    proofs = prove_range(hasher, leaves, 15_000, 32_000, 10_000)
+    assert [index for index, _ in proofs] == [1, 2, 3]
+
+    assert verify_range(hasher, root, io.BytesIO(data), len(data), 15_000, 32_000, proofs, 10_000)
+    tampered = bytearray(data)
+    tampered[31_999] ^= 1
+    assert not verify_range(hasher, root, io.BytesIO(bytes(tampered)), len(data), 15_000, 32_000, proofs, 10_000)
+    # Доказательство не покрывает весь запрошенный диапазон
+    assert not verify_range(hasher, root, io.BytesIO(data), len(data), 15_000, 42_000, proofs, 10_000)
+
+
+def test_cli_prove_and_verify_range(tmp_path, capsys):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 100)
+
+    assert main([str(path), "--leaf-size", "4096", "-j", "1", "--prove", "5000:9000"]) == 0
+    proof = tmp_path / "proof.json"
+    proof.write_text(capsys.readouterr().out)
+    root = json.loads(proof.read_text())["root"]
+
+    assert main([str(path), "--verify-range", str(proof), "--root", root]) == 0
+    data = bytearray(path.read_bytes())
+    data[8999] ^= 1
+    path.write_bytes(bytes(data))
+    assert main([str(path), "--verify-range", str(proof)]) == 1
@@ -0,0 +1,267 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gost341112 import GOST341112
+
+DEFAULT_LEAF_SIZE = 1024 * 1024
+# Префиксы разделяют листья и внутренние узлы, чтобы лист нельзя было выдать за узел
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+# Как часто сохранять список листьев при хэшировании с возобновлением
+_SAVE_EVERY = 16
+
+_worker_hasher = None
+
+
+def hash_leaf(hasher: GOST341112, chunk) -> bytes:
+    h = hasher.new(length=1 + len(chunk))
+    h.update(_LEAF_PREFIX)
+    h.update(chunk)
+    return h.digest()
+
+
+def hash_node(hasher: GOST341112, left: bytes, right: bytes) -> bytes:
+    return hasher.hash(_NODE_PREFIX + left + right)
+
+
+def merkle_levels(hasher: GOST341112, leaves: list[bytes]) -> list[list[bytes]]:
+    """
+    Строит уровни дерева снизу вверх. Непарный последний узел уровня
+    поднимается на следующий уровень без изменений.
+    """
+    if not leaves:
+        leaves = [hash_leaf(hasher, b'')]
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        upper = [hash_node(hasher, level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            upper.append(level[-1])
+        levels.append(upper)
+    return levels
+
+
+def merkle_root(hasher: GOST341112, leaves: list[bytes]) -> bytes:
+    return merkle_levels(hasher, leaves)[-1][0]
+
+
+def merkle_proof(hasher: GOST341112, leaves: list[bytes], index: int) -> list[tuple[str, bytes]]:
+    """
+    Возвращает путь от листа index до корня: список пар (сторона соседа, хэш соседа).
+    """
+    proof = []
+    for level in merkle_levels(hasher, leaves)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(('L' if sibling < index else 'R', level[sibling]))
+        index //= 2
+    return proof
+
+
+def verify_proof(hasher: GOST341112, root: bytes, chunk, proof: list[tuple[str, bytes]]) -> bool:
+    node = hash_leaf(hasher, chunk)
+    for side, sibling in proof:
+        node = hash_node(hasher, sibling, node) if side == 'L' else hash_node(hasher, node, sibling)
+    return node == root
+
+
+def leaves_for_range(offset: int, length: int, leaf_size: int = DEFAULT_LEAF_SIZE) -> range:
+    """
+    Номера листьев, покрывающих байты [offset, offset + length):
+    для проверки диапазона достаточно прочитать эти листья и их доказательства.
+    """
+    if length <= 0:
+        return range(0)
+    return range(offset // leaf_size, (offset + length - 1) // leaf_size + 1)
+
+
+def prove_range(hasher: GOST341112, leaves: list[bytes], start: int, end: int,
+                leaf_size: int = DEFAULT_LEAF_SIZE) -> list[tuple[int, list[tuple[str, bytes]]]]:
+    """
+    Доказательства для всех листьев, покрывающих байты [start, end).
+
+    :return: Список пар (номер листа, доказательство merkle_proof)
+    """
+    return [(i, merkle_proof(hasher, leaves, i)) for i in leaves_for_range(start, end - start, leaf_size)]
+
+
+def verify_range(hasher: GOST341112, root: bytes, f, size: int, start: int, end: int,
+                 proofs: list[tuple[int, list[tuple[str, bytes]]]], leaf_size: int = DEFAULT_LEAF_SIZE) -> bool:
+    """
+    Проверяет байты [start, end) файла f по корню root, читая только покрывающие их листья.
+
+    :param: f: Файл, открытый в режиме "rb", с данными на своих местах (копия исходного или его часть)
+    :param: size: Размер исходного файла, чтобы знать длину последнего листа
+    :param: proofs: Результат prove_range
+    :return: True, если все листья диапазона сходятся к root
+    """
+    if [index for index, _ in proofs] != list(leaves_for_range(start, end - start, leaf_size)):
+        return False
+    for index, proof in proofs:
+        offset = index * leaf_size
+        length = min(leaf_size, size - offset)
+        f.seek(offset)
+        chunk = f.read(length)
+        if len(chunk) != length or not verify_proof(hasher, root, chunk, proof):
+            return False
+    return True
+
+
+def _init_worker(hash_size: int):
+    global _worker_hasher
+    _worker_hasher = GOST341112(hash_size=hash_size)
+
+
+def _hash_leaf_worker(path: str, index: int, leaf_size: int) -> tuple[int, str]:
+    # Отображается только диапазон листа: смещение mmap выравнивается вниз
+    # по ALLOCATIONGRANULARITY, а лишние байты в начале пропускаются
+    offset = index * leaf_size
+    aligned = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        length = min(leaf_size, os.fstat(f.fileno()).st_size - offset)
+        with mmap.mmap(f.fileno(), offset - aligned + length, access=mmap.ACCESS_READ, offset=aligned) as mm:
+            view = memoryview(mm)
+            try:
+                digest = hash_leaf(_worker_hasher, view[offset - aligned:])
+            finally:
+                view.release()
+    return index, digest.hex()
+
+
+def _load_state(state_path: Path, path, hash_size: int, leaf_size: int) -> list:
+    st = os.stat(path)
+    if state_path.exists():
+        state = json.loads(state_path.read_text())
+        if (state['size'], state['mtime_ns'], state['hash_size'], state['leaf_size']) == \
+                (st.st_size, st.st_mtime_ns, hash_size, leaf_size):
+            return state['leaves']
+    return [None] * -(-st.st_size // leaf_size)
+
+
+def _save_state(state_path: Path, path, hash_size: int, leaf_size: int, leaves: list):
+    st = os.stat(path)
+    state = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'hash_size': hash_size,
+        'leaf_size': leaf_size,
+        'leaves': leaves,
+    }
+    tmp = Path(f"{state_path}.tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, state_path)
+
+
+def tree_hash_file(path, hash_size=512, leaf_size=DEFAULT_LEAF_SIZE, jobs=None, state_path=None) -> list[bytes]:
+    """
+    Хэширует листья файла в пуле процессов и возвращает их список.
+
+    Если задан state_path, готовые листья периодически сохраняются туда,
+    и повторный запуск для неизменного файла досчитывает только недостающие.
+    """
+    if os.path.getsize(path) == 0:
+        return [hash_leaf(GOST341112(hash_size=hash_size), b'')]
+
+    state_path = Path(state_path) if state_path else None
+    if state_path:
+        leaves = _load_state(state_path, path, hash_size, leaf_size)
+    else:
+        leaves = [None] * -(-os.path.getsize(path) // leaf_size)
+
+    pending = [i for i, leaf in enumerate(leaves) if leaf is None]
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(hash_size,)) as pool:
+            futures = [pool.submit(_hash_leaf_worker, str(path), i, leaf_size) for i in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                index, digest = future.result()
+                leaves[index] = digest
+                if state_path and done % _SAVE_EVERY == 0:
+                    _save_state(state_path, path, hash_size, leaf_size, leaves)
+
+    if state_path:
+        _save_state(state_path, path, hash_size, leaf_size, leaves)
+    return [bytes.fromhex(leaf) for leaf in leaves]
+
+
+def _parse_range(value: str) -> tuple[int, int]:
+    start, _, end = value.partition(':')
+    start, end = int(start), int(end)
+    if not 0 <= start < end:
+        raise argparse.ArgumentTypeError("диапазон задается как START:END, 0 <= START < END")
+    return start, end
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Древовидный (Меркла) хэш ГОСТ 34.11-2012 для больших файлов")
+    parser.add_argument('path', help="Хэшируемый файл (при --verify-range - файл с проверяемыми данными)")
+    parser.add_argument('--size', type=int, choices=(256, 512), default=512, help="Размер хэша в битах")
+    parser.add_argument('--leaf-size', type=int, default=DEFAULT_LEAF_SIZE, help="Размер листа в байтах")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Число процессов (по умолчанию все ядра)")
+    parser.add_argument('--state', help="Файл со списком листьев для возобновления")
+    parser.add_argument('--proof', type=int, help="Вывести доказательство для листа с этим номером")
+    parser.add_argument('--prove', type=_parse_range, metavar='START:END',
+                        help="Вывести в JSON доказательство для байтов [START, END)")
+    parser.add_argument('--verify-range', metavar='PROOF',
+                        help="Проверить байты файла по JSON-доказательству из --prove")
+    parser.add_argument('--root', help="Доверенный корень для --verify-range (шестнадцатеричный)")
+    args = parser.parse_args(argv)
+
+    if args.verify_range:
+        document = json.loads(Path(args.verify_range).read_text())
+        root = bytes.fromhex(document['root'])
+        if args.root is not None and bytes.fromhex(args.root) != root:
+            print(f"{args.path} {document['start']}:{document['end']}: FAILED (другой корень)")
+            return 1
+        proofs = [
+            (leaf['index'], [(side, bytes.fromhex(sibling)) for side, sibling in leaf['proof']])
+            for leaf in document['leaves']
+        ]
+        with open(args.path, 'rb') as f:
+            ok = verify_range(
+                GOST341112(hash_size=document['hash_size']), root, f, document['size'],
+                document['start'], document['end'], proofs, document['leaf_size'],
+            )
+        print(f"{args.path} {document['start']}:{document['end']}: {'OK' if ok else 'FAILED'}")
+        return 0 if ok else 1
+
+    hasher = GOST341112(hash_size=args.size)
+    leaves = tree_hash_file(args.path, args.size, args.leaf_size, args.jobs, args.state)
+    root = merkle_root(hasher, leaves)
+
+    if args.prove is not None:
+        start, end = args.prove
+        size = os.path.getsize(args.path)
+        if end > size:
+            parser.error(f"Диапазон выходит за конец файла ({size} байт)")
+        document = {
+            'hash_size': args.size,
+            'leaf_size': args.leaf_size,
+            'size': size,
+            'root': root.hex(),
+            'start': start,
+            'end': end,
+            'leaves': [
+                {'index': index, 'proof': [[side, sibling.hex()] for side, sibling in proof]}
+                for index, proof in prove_range(hasher, leaves, start, end, args.leaf_size)
+            ],
+        }
+        print(json.dumps(document, indent=2))
+        return 0
+
+    print(f"{root.hex()}  {args.path}")
+
+    if args.proof is not None:
+        if not 0 <= args.proof < len(leaves):
+            parser.error(f"Номер листа должен быть от 0 до {len(leaves) - 1}")
+        for side, sibling in merkle_proof(hasher, leaves, args.proof):
+            print(f"{side} {sibling.hex()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import argparse
+import random
+import time
+
+from dsa.lib.curve import SCALAR_MULT_METHODS, EllipticCurve, Point
+
+GOST_CURVE = (
+    0x07,
+    0x5FBFF498AA938CE739B8E022FBAFEF40563F6E6A3472FC2A514C0CE9DAE23B7E,
+    0x8000000000000000000000000000000000000000000000000000000000000431,
+)
+GOST_POINT = (2, 0x8E2A8A0E65147D4BD6316030E16D19C85C97F0A9CA267122B96ABBCEA7E8FC8)
+GOST_Q = 0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3
+
+# Маленькие кривые из лабораторной 2.2
+SMALL_CURVES = [(3, 6, 29), (2, 3, 97), (1, 1, 1543)]
+
+
+def _first_point(curve: EllipticCurve) -> Point:
+    for x in range(1, curve.p):
+        rhs = (x**3 + curve.a * x + curve.b) % curve.p
+        if rhs and pow(rhs, (curve.p - 1) // 2, curve.p) == 1:
+            return Point(curve, x, Point.mod_sqrt(rhs, curve.p))
+    raise ValueError("The curve has no affine points with y != 0.")
+
+
+def measure(point: Point, scalars: list[int], method: str, window: int, min_time: float) -> float:
+    """
+    Возвращает среднее время одного умножения в микросекундах
+    """
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        for n in scalars:
+            point.multiply(n, method, window)
+        runs += len(scalars)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return elapsed / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение способов умножения точки на скаляр")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Минимальное время одного замера, с")
+    parser.add_argument("--window", type=int, action="append", help="Ширина окна wNAF (можно несколько)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = [("GOST 34.10 256", Point(EllipticCurve(*GOST_CURVE), *GOST_POINT), GOST_Q)]
+    for a, b, p in SMALL_CURVES:
+        curve = EllipticCurve(a, b, p)
+        cases.append((str(curve), _first_point(curve), p + 1 + 2 * int(p**0.5)))
+
+    for name, point, bound in cases:
+        scalars = [rng.randrange(1, bound) for _ in range(32)]
+        print(name)
+        for method in SCALAR_MULT_METHODS:
+            windows = (args.window or [4, 5]) if method == "wnaf" else [4]
+            for window in windows:
+                label = f"{method} w={window}" if method == "wnaf" else method
+                print(f"  {label:12} {measure(point, scalars, method, window, args.min_time):12.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
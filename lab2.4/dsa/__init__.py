@@ -1,3 +1,19 @@
+from .drbg import StreebogDRBG
 from .gost341012 import GostDSA
+from .keycache import PublicKeyCache
+from .params import PARAMETER_SETS, ParameterSet
+from .pool import GostDSAPool
+from .service import GostDSAClient, GostDSAService
+from .signer import GostSigner
 
-__all__ = ["GostDSA"]
+__all__ = [
+    "GostDSA",
+    "GostDSAClient",
+    "GostDSAPool",
+    "GostDSAService",
+    "GostSigner",
+    "PARAMETER_SETS",
+    "ParameterSet",
+    "PublicKeyCache",
+    "StreebogDRBG",
+]
@@ -0,0 +1,164 @@
+import os
+import threading
+
+from .gost341112 import GOST341112
+
+_MASK512 = (1 << 512) - 1
+
+
+class StreebogDRBG:
+    def __init__(
+        self,
+        seed: bytes = None,
+        personalization: bytes = b"",
+        buffer_size: int = 4096,
+        reseed_interval: int = 1 << 32,
+    ):
+        """
+        Детерминированный генератор случайных битов на примитивах ГОСТ 34.11-2012.
+
+        Устроен как CTR_DRBG из NIST SP 800-90A: выход - блочный шифр E из Стрибога
+        (12 раундов LPSX над 512-битным блоком) в режиме счетчика на ключе K от V,
+        после каждого запроса K и V обновляются двумя блоками того же шифра.
+        Раундовые ключи K вычисляются один раз на ключ, поэтому блок выхода стоит
+        около трети сжатия g, тогда как блок HMAC-DRBG на HMAC-Стрибоге стоит
+        около шести сжатий. Материал для засева (энтропия, nonce, персонализация)
+        сжимается в 1024 бита функцией вывода на Стрибоге-512, как Hash_df.
+
+        Выход запрашивается блоками по buffer_size байт и раздается из буфера.
+        Объект можно использовать из нескольких потоков. После fork состояние
+        родителя не используется: генератор пересевается из os.urandom.
+
+        :param: seed: Засев для воспроизводимого потока (например, для бенчмарков).
+            По умолчанию генератор засевается из os.urandom
+        :param: personalization: Строка персонализации
+        :param: buffer_size: Размер буфера выхода в байтах
+        :param: reseed_interval: Через сколько заполнений буфера пересеваться из os.urandom
+        """
+        self._hasher = GOST341112(hash_size=512)
+        self.buffer_size = -(-buffer_size // 64) * 64
+        self.reseed_interval = reseed_interval
+        self.deterministic = seed is not None
+        self._lock = threading.Lock()
+        self._K = 0
+        self._V = 0
+        self._keys = self._hasher._round_keys(0)
+        if seed is None:
+            seed = os.urandom(64) + os.urandom(32)
+        self._update(self._derive(seed + personalization))
+        self._reseed_counter = 1
+        self._pid = os.getpid()
+        self._buffer = b""
+        self._offset = 0
+
+    def reseed(self, entropy: bytes = None, additional: bytes = b""):
+        """
+        Подмешивает новую энтропию в состояние и сбрасывает буфер
+
+        :param: entropy: Энтропия, по умолчанию 64 байта из os.urandom
+        :param: additional: Дополнительные данные
+        """
+        with self._lock:
+            self._reseed(os.urandom(64) if entropy is None else entropy, additional)
+
+    def _reseed(self, entropy: bytes, additional: bytes = b""):
+        self._update(self._derive(entropy + additional))
+        self._reseed_counter = 1
+        self._pid = os.getpid()
+        self._buffer = b""
+        self._offset = 0
+
+    def random_bytes(self, n: int) -> bytes:
+        """
+        :return: n случайных байт
+        """
+        with self._lock:
+            return self._take(n)
+
+    def randbits(self, k: int) -> int:
+        """
+        :return: Случайное число из k бит
+        """
+        if k <= 0:
+            return 0
+        with self._lock:
+            n = (k + 7) // 8
+            return int.from_bytes(self._take(n)) >> (8 * n - k)
+
+    def scalar(self, q: int) -> int:
+        """
+        Равномерно распределенное число из [1, q - 1] выборкой с отказом:
+        берется q.bit_length() бит, и неподходящие значения отбрасываются
+
+        :param: q: Порядок подгруппы, q > 1
+        :return: Скаляр 1 <= k < q
+        """
+        if q <= 1:
+            raise ValueError("q must be greater than 1.")
+        bits = q.bit_length()
+        n = (bits + 7) // 8
+        shift = 8 * n - bits
+        with self._lock:
+            while True:
+                k = int.from_bytes(self._take(n)) >> shift
+                if 0 < k < q:
+                    return k
+
+    def _take(self, n: int) -> bytes:
+        if self._pid != os.getpid():
+            # Процесс-потомок не должен повторять выход родителя
+            self._reseed(os.urandom(64), self._pid.to_bytes(8))
+        if self._offset + n > len(self._buffer):
+            # Буфер пополняется только целыми блоками buffer_size, поэтому поток
+            # выхода не зависит от того, какими порциями его запрашивают
+            parts = [self._buffer[self._offset:]]
+            available = len(parts[0])
+            while available < n:
+                parts.append(self._generate(self.buffer_size))
+                available += self.buffer_size
+            self._buffer = b"".join(parts)
+            self._offset = 0
+        chunk = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return chunk
+
+    def _generate(self, n: int) -> bytes:
+        if self._reseed_counter > self.reseed_interval:
+            self._reseed(os.urandom(64))
+        blocks = []
+        V = self._V
+        for _ in range(-(-n // 64)):
+            V = (V + 1) & _MASK512
+            blocks.append(self._encrypt(V).to_bytes(64))
+        self._V = V
+        self._update(0)
+        self._reseed_counter += 1
+        return b"".join(blocks)[:n]
+
+    def _encrypt(self, block: int) -> int:
+        lps = self._hasher._lps
+        keys = self._keys
+        state = block
+        for i in range(12):
+            state = lps(state ^ keys[i])
+        return state ^ keys[12]
+
+    def _update(self, provided: int):
+        """
+        CTR_DRBG_Update: новые K и V - два следующих блока шифра, сложенные с provided
+        """
+        V1 = (self._V + 1) & _MASK512
+        V2 = (self._V + 2) & _MASK512
+        temp = ((self._encrypt(V1) << 512) | self._encrypt(V2)) ^ provided
+        self._K = temp >> 512
+        self._V = temp & _MASK512
+        self._keys = self._hasher._round_keys(self._K)
+
+    def _derive(self, data: bytes) -> int:
+        """
+        Функция вывода в стиле Hash_df: H(1 || 1024 || data) || H(2 || 1024 || data)
+        """
+        length = (1024).to_bytes(4)
+        return int.from_bytes(
+            self._hasher.hash(b"\x01" + length + data) + self._hasher.hash(b"\x02" + length + data)
+        )
@@ -1,26 +1,85 @@
-from .lib.curve import EllipticCurve, Point
-from random import randint
-from .gost341112 import GOST341112
+import os
+from pathlib import Path
+
+from .drbg import StreebogDRBG
+from .keycache import PublicKeyCache
+from .lib.curve import (
+    EdwardsFixedBaseTable,
+    EllipticCurve,
+    FixedBaseTable,
+    Point,
+    TwistedEdwardsCurve,
+    _jacobian_add,
+    _jacobian_x_mod_equals,
+)
+from .params import DEFAULT_PARAMETER_SET, ParameterSet, get_parameter_set
+from .gost341112 import GOST341112, hash_fileobj
 
 
 class GostDSA:
-    def __init__(self):
+    def __init__(
+        self,
+        table_path: str = None,
+        key_cache_bytes: int = None,
+        param_set: str | ParameterSet = DEFAULT_PARAMETER_SET,
+        drbg: StreebogDRBG = None,
+    ):
         """
         Создает имплементацию цифровой подписи по ГОСТ 34.10-2012
+
+        :param: table_path: Файл для таблицы кратных точки P. Если он есть, таблица
+            загружается из него, иначе строится при первом умножении и сохраняется туда
+        :param: key_cache_bytes: Ограничение памяти кэша открытых ключей. По умолчанию
+            рассчитывается на keycache.DEFAULT_HOT_KEYS ключей с таблицами кратных
+        :param: param_set: Набор параметров из dsa.params.PARAMETER_SETS (имя или сам набор).
+            Для наборов на скрученных кривых Эдвардса кратные P считаются на кривой
+            Эдвардса, а ключи и подписи остаются в форме Вейерштрасса
+        :param: drbg: Генератор закрытых ключей и одноразовых k. По умолчанию
+            StreebogDRBG, засеянный из os.urandom; с StreebogDRBG(seed=...) подписи воспроизводимы
         """
-        hasher = GOST341112(hash_size=256)
-        self.hash = hasher.hash
-        p = 0x8000000000000000000000000000000000000000000000000000000000000431
-        a = 0x07
-        b = 0x5FBFF498AA938CE739B8E022FBAFEF40563F6E6A3472FC2A514C0CE9DAE23B7E
-        self.curve = EllipticCurve(a=a, b=b, p=p)
-        self.P = Point(
-            self.curve,
-            x=2,
-            y=0x8E2A8A0E65147D4BD6316030E16D19C85C97F0A9CA267122B96ABBCEA7E8FC8,
+        self.params = get_parameter_set(param_set)
+        self.size = self.params.size
+        self.hasher = GOST341112(hash_size=self.params.hash_size)
+        self.hash = self.hasher.hash
+        self.curve = EllipticCurve(a=self.params.a, b=self.params.b, p=self.params.p, scalar_mult="wnaf")
+        self.P = Point(self.curve, x=self.params.x, y=self.params.y)
+        self.q = self.params.q
+        self.m = self.params.m
+        self.edwards = None
+        if self.params.is_edwards:
+            self.edwards = TwistedEdwardsCurve(self.params.e, self.params.d, self.params.p)
+            weierstrass = self.edwards.to_weierstrass()
+            if (weierstrass.a, weierstrass.b) != (self.curve.a % self.curve.p, self.curve.b):
+                raise ValueError(f"The Edwards curve of {self.params.name} does not match its Weierstrass form.")
+        self.drbg = drbg if drbg is not None else StreebogDRBG()
+        self.table_path = table_path
+        self._P_table = None
+        self.key_cache = PublicKeyCache(
+            self.curve, self.q.bit_length(), max_bytes=key_cache_bytes, cofactor=self.m // self.q
         )
-        self.q = 0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3
-        self.m = 0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3
+
+    def _base_table(self) -> FixedBaseTable | EdwardsFixedBaseTable:
+        """
+        Таблица кратных образующей точки P, строится один раз на экземпляр
+        """
+        if self._P_table is None:
+            if self.table_path and os.path.exists(self.table_path):
+                try:
+                    if self.edwards is not None:
+                        self._P_table = EdwardsFixedBaseTable.load(self.P, self.edwards, self.table_path)
+                    else:
+                        self._P_table = FixedBaseTable.load(self.P, self.table_path)
+                except (OSError, ValueError, KeyError, TypeError):
+                    # Поврежденный или чужой файл таблицы не мешает работе: она строится заново
+                    self._P_table = None
+            if self._P_table is None:
+                if self.edwards is not None:
+                    self._P_table = EdwardsFixedBaseTable(self.P, self.edwards, self.q.bit_length())
+                else:
+                    self._P_table = FixedBaseTable(self.P, self.q.bit_length())
+                if self.table_path:
+                    self._P_table.save(self.table_path)
+        return self._P_table
 
     def generate_key_pair(self) -> tuple[str, str]:
         """
@@ -28,12 +87,19 @@ class GostDSA:
 
         :return: (private_key, public_key): Кортеж, содержащий закрытый и открытый ключи
         """
-        d = randint(0, self.q)
-        Q = d * self.P
-        public_key = Q.compress()
-        private_key = hex(d)[2:].zfill(64)
+        private_key, public_key = self.generate_key_pair_bytes()
+        return private_key.hex(), public_key.hex()
 
-        return private_key, public_key
+    def generate_key_pair_bytes(self) -> tuple[bytes, bytes]:
+        """
+        То же, что generate_key_pair, но ключи в байтах
+
+        :return: (private_key, public_key): Закрытый ключ длиной size байт (big-endian)
+            и сжатый открытый ключ
+        """
+        d = self.drbg.scalar(self.q)
+        Q = self._base_table().multiply(d)
+        return d.to_bytes(self.size), Q.compress_bytes()
 
     def sign(self, message: bytes, private_key: str) -> str:
         """
@@ -43,19 +109,21 @@ class GostDSA:
         :param: private_key: Закрытый ключ
         :return: Шестнадцетиричная строка из конкатенированных двух векторов (r|s)
         """
-        d = int(private_key, 16)
-        z = int(self.hash(message).hex(), 16)
-        e = z % self.q
-        if e == 0:
-            e = 1
-        s = 0
-        r, k = self._find_r()
-        while s == 0:
-            r, k = self._find_r()
-            s = (r * d + k * e) % self.q
+        r, s = self._sign_scalars(message, int(private_key, 16))
+        return (r.to_bytes(self.size) + s.to_bytes(self.size)).hex()
+
+    def sign_bytes(self, message: bytes | memoryview, private_key: bytes | memoryview) -> bytes:
+        """
+        То же, что sign, но ключ и подпись передаются в байтах без перевода в строки
 
-        sig = bytes.fromhex(hex(r)[2:].zfill(64)) + bytes.fromhex(hex(s)[2:].zfill(64))
-        return sig.hex()
+        :param: message: Подписываемое сообщение
+        :param: private_key: Закрытый ключ длиной size байт (big-endian)
+        :return: Подпись r|s длиной 2 * size байт
+        """
+        if len(private_key) != self.size:
+            raise ValueError(f"The private key must be {self.size} bytes long.")
+        r, s = self._sign_scalars(message, int.from_bytes(private_key))
+        return r.to_bytes(self.size) + s.to_bytes(self.size)
 
     def check(self, signature: str, message: bytes, public_key: str) -> bool:
         """
@@ -67,33 +135,203 @@ class GostDSA:
 
         :return: True, если подпись валидная, False если нет
         """
-        Q = Point.uncompress(self.curve, public_key)
+        context = self.key_cache.get(public_key)
+        half = len(signature) // 2
+        r = int(signature[:half], 16)
+        s = int(signature[half:], 16)
+        return self._check_scalars(r, s, self._message_scalar(message), context)
 
-        r_b, s_b = bytes.fromhex(signature[: len(signature) // 2]), bytes.fromhex(
-            signature[len(signature) // 2 :]
-        )
-        r = int.from_bytes(r_b)
-        s = int.from_bytes(s_b)
+    def check_bytes(
+        self,
+        signature: bytes | memoryview,
+        message: bytes | memoryview,
+        public_key: bytes | memoryview,
+    ) -> bool:
+        """
+        То же, что check, но подпись и ключ передаются в байтах
+
+        :param: signature: Подпись r|s длиной 2 * size байт
+        :param: message: Изначальное сообщение
+        :param: public_key: Сжатый открытый ключ
+        :return: True, если подпись валидная, False если нет
+        """
+        if len(signature) != 2 * self.size:
+            return False
+        context = self.key_cache.get(public_key)
+        r = int.from_bytes(signature[: self.size])
+        s = int.from_bytes(signature[self.size :])
+        return self._check_scalars(r, s, self._message_scalar(message), context)
+
+    def sign_stream(self, f, private_key: str) -> str:
+        """
+        Подписывает содержимое открытого бинарного файла или потока, не читая его целиком в память.
+        Хэш считается потоково: обычные файлы через mmap, объекты с seek - кусками
+
+        :param: f: Файл или поток, открытый в режиме "rb"
+        :param: private_key: Закрытый ключ
+        :return: Подпись, как у sign
+        """
+        r, s = self._sign_digest(hash_fileobj(self.hasher, f), int(private_key, 16))
+        return (r.to_bytes(self.size) + s.to_bytes(self.size)).hex()
+
+    def check_stream(self, signature: str, f, public_key: str) -> bool:
+        """
+        Проверяет подпись содержимого открытого бинарного файла или потока, как sign_stream
+        """
+        context = self.key_cache.get(public_key)
+        half = len(signature) // 2
+        r = int(signature[:half], 16)
+        s = int(signature[half:], 16)
+        return self._check_scalars(r, s, self._digest_scalar(hash_fileobj(self.hasher, f)), context)
+
+    def sign_file(self, path, private_key: str, signature_path=None) -> str:
+        """
+        Подписывает файл и записывает отделенную подпись рядом с ним
+
+        :param: path: Путь к подписываемому файлу
+        :param: private_key: Закрытый ключ
+        :param: signature_path: Куда записать подпись, по умолчанию <path>.sig
+        :return: Подпись, как у sign
+        """
+        with open(path, "rb") as f:
+            signature = self.sign_stream(f, private_key)
+        Path(signature_path or f"{path}.sig").write_text(signature + "\n")
+        return signature
 
-        z = int(self.hash(message).hex(), 16)
-        e = z % self.q
-        if e == 0:
-            e = 1
+    def check_file(self, path, public_key: str, signature_path=None) -> bool:
+        """
+        Проверяет отделенную подпись файла, записанную sign_file
+
+        :param: path: Путь к файлу
+        :param: public_key: Открытый ключ для проверки подписи
+        :param: signature_path: Файл подписи, по умолчанию <path>.sig
+        :return: True, если подпись валидная, False если нет
+        """
+        signature = Path(signature_path or f"{path}.sig").read_text().strip()
+        with open(path, "rb") as f:
+            return self.check_stream(signature, f, public_key)
+
+    def check_many(self, items: list[tuple[str, bytes, str]]) -> list[bool]:
+        """
+        Проверяет пакет подписей быстрее, чем отдельные вызовы check.
+
+        Одинаковые сообщения хэшируются один раз, каждый открытый ключ берется из кэша
+        один раз на пакет, а для часто встречающихся ключей кэш строит таблицу кратных Q.
+        Равенство x(C) mod q = r проверяется в координатах Якоби без обращения.
+        В подписи хранится только x(C), без знака y, поэтому случайную линейную
+        комбинацию уравнений (и поиск плохих подписей делением пополам) построить
+        нельзя: результат сразу считается для каждой подписи отдельно.
+
+        :param: items: Список кортежей (signature, message, public_key) как для check
+        :return: Список результатов проверки в порядке items; подписи и ключи,
+            которые не удалось разобрать, считаются невалидными
+        """
+        parsed = []
+        for signature, message, public_key in items:
+            try:
+                half = len(signature) // 2
+                parsed.append((int(signature[:half], 16), int(signature[half:], 16), message, public_key))
+            except ValueError:
+                parsed.append(None)
+        return self._check_many_scalars(parsed)
+
+    def check_many_bytes(self, items: list[tuple[bytes, bytes, bytes]]) -> list[bool]:
+        """
+        То же, что check_many, для подписей, сообщений и ключей в байтах
+        """
+        parsed = []
+        for signature, message, public_key in items:
+            if len(signature) != 2 * self.size:
+                parsed.append(None)
+                continue
+            r = int.from_bytes(signature[: self.size])
+            s = int.from_bytes(signature[self.size :])
+            parsed.append((r, s, bytes(message), bytes(public_key)))
+        return self._check_many_scalars(parsed)
+
+    def _message_scalar(self, message: bytes | memoryview) -> int:
+        """
+        Хэш сообщения как число e по модулю q (e = 1, если остаток нулевой)
+        """
+        return self._digest_scalar(self.hash(message))
+
+    def _digest_scalar(self, digest: bytes) -> int:
+        # Дайджест - строка байт, младший байт вектора хэша идет первым
+        e = int.from_bytes(digest, byteorder='little') % self.q
+        return e if e != 0 else 1
+
+    def _sign_scalars(self, message: bytes | memoryview, d: int) -> tuple[int, int]:
+        return self._sign_digest(self.hash(message), d)
+
+    def _sign_digest(self, digest: bytes, d: int) -> tuple[int, int]:
+        e = self._digest_scalar(digest)
+        s = 0
+        while s == 0:
+            r, k = self._find_r()
+            s = (r * d + k * e) % self.q
+        return r, s
+
+    def _check_scalars(self, r: int, s: int, e: int, context) -> bool:
+        if not context.valid:
+            return False
         V = pow(e, -1, self.q)
         z1 = s * V % self.q
         z2 = -r * V % self.q
 
-        C = z1 * self.P + z2 * Q
-        R = C.x % self.q
+        if context.table is None:
+            C = Point.multi_scalar([(z1, self.P), (z2, context.point)])
+            return C.x is not None and C.x % self.q == r
+
+        C = _jacobian_add(
+            self._base_table().multiply_jacobian(z1),
+            context.multiply_jacobian(z2),
+            self.curve.a,
+            self.curve.p,
+        )
+        return _jacobian_x_mod_equals(C, r, self.q, self.curve.p)
+
+    def _check_many_scalars(self, parsed: list) -> list[bool]:
+        """
+        Общая часть check_many и check_many_bytes
+
+        :param: parsed: Кортежи (r, s, message, public_key) или None для неразобранных подписей
+        """
+        results = [False] * len(parsed)
+        digests = {}
+        groups = {}
+        for index, item in enumerate(parsed):
+            if item is None:
+                continue
+            r, s, message, public_key = item
+            if message not in digests:
+                digests[message] = self._message_scalar(message)
+            groups.setdefault(public_key, []).append((index, r, s, digests[message]))
+
+        P_table = self._base_table()
+        p = self.curve.p
+        for public_key, group in groups.items():
+            try:
+                context = self.key_cache.get(public_key, uses=len(group))
+            except ValueError:
+                continue
+            if not context.valid:
+                continue
+
+            for index, r, s, e in group:
+                V = pow(e, -1, self.q)
+                z1 = s * V % self.q
+                z2 = -r * V % self.q
+                C = _jacobian_add(P_table.multiply_jacobian(z1), context.multiply_jacobian(z2), self.curve.a, p)
+                results[index] = _jacobian_x_mod_equals(C, r, self.q, p)
 
-        return R == r
+        return results
 
     def _find_r(self) -> tuple[int, int]:
         r = 0
         k = 0
         while r == 0:
-            k = randint(0, self.q)
-            C = k * self.P
+            k = self.drbg.scalar(self.q)
+            C = self._base_table().multiply(k)
             r = C.x % self.q
 
         return r, k
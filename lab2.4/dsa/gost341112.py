@@ -1,6 +1,23 @@
+import argparse
+import io
+import mmap
+import os
+import stat
+import struct
+import sys
+import time
 from pathlib import Path
 
+_MASK512 = (1 << 512) - 1
+_pack_words = struct.Struct('>8Q').pack
+# Окно, после которого уже прочитанные страницы mmap отдаются обратно ядру
+_MMAP_WINDOW = 16 * 1024 * 1024
+
+
 class GOST341112:
+    # Таблицы LPS не зависят от размера хэша, поэтому строятся один раз на процесс
+    _lps_tables_cache = None
+
     def __init__(self, hash_size=512):
         assert hash_size in (256, 512), "Invalid hash size"
         self.hash_size = hash_size
@@ -9,6 +26,11 @@ class GOST341112:
         self.tau = self._get_tau_table()
         self.matrix_A = self._get_matrix_A()
         self.constants = self._get_constants()
+        self.int_constants = [int.from_bytes(c, byteorder='big') for c in self.constants]
+        self.lps_tables = self._get_lps_tables()
+        # Первое сжатие любого сообщения идет с h = IV и N = 0, поэтому его раундовые ключи постоянны
+        self.iv_int = int.from_bytes(self._get_iv(), byteorder='big')
+        self.iv_round_keys = self._round_keys(self._lps(self.iv_int))
 
     def _get_iv(self):
         if self.hash_size == 256:
@@ -66,6 +88,26 @@ class GOST341112:
             matrix.append(bytes.fromhex(row))
         return matrix
 
+    def _get_lps_tables(self):
+        # T[k][b] - вклад байта b, стоящего на k-й позиции 64-битного слова, в L(P(S(x))):
+        # байт проходит через pi, а каждый его установленный бит добавляет строку matrix_A
+        cls = type(self)
+        if cls._lps_tables_cache is None:
+            rows = [int.from_bytes(row, byteorder='big') for row in self.matrix_A]
+            tables = []
+            for k in range(8):
+                table = []
+                for b in range(256):
+                    v = self.pi[b]
+                    acc = 0
+                    for t in range(8):
+                        if (v >> (7 - t)) & 1:
+                            acc ^= rows[8 * k + t]
+                    table.append(acc)
+                tables.append(tuple(table))
+            cls._lps_tables_cache = tuple(tables)
+        return cls._lps_tables_cache
+
     def _get_constants(self):
         return [
             bytes.fromhex( # C1
@@ -118,87 +160,339 @@ class GOST341112:
             )
         ]
 
-    def _S(self, data):
-        return bytes([self.pi[b] for b in data])
-    
-    def _P(self, data):
-        permuted = bytearray(64)
-        for i in range(64):
-            permuted[i] = data[self.tau[i]]
-        return bytes(permuted)
-
-    def _L(self, data):
-        result = bytearray(64)
-        for i in range(8):
-            chunk = data[i*8:(i+1)*8]
-            vec = int.from_bytes(chunk, byteorder='big')
-            res = 0
-            for j in range(64):
-                if (vec >> (63-j)) & 1:
-                    res ^= int.from_bytes(self.matrix_A[j], byteorder='big')
-            result[i*8:(i+1)*8] = res.to_bytes(8, byteorder='big')
-        return bytes(result)
-
-    def _LPS(self, data):
-        return self._L(self._P(self._S(data)))
-
-    def _E(self, K, m):
+    def _lps(self, state: int) -> int:
+        # После перестановки tau байт x[8k+i] попадает на k-ю позицию i-го слова,
+        # поэтому каждое выходное слово - это XOR восьми табличных значений
+        x = state.to_bytes(64, byteorder='big')
+        t0, t1, t2, t3, t4, t5, t6, t7 = self.lps_tables
+        return int.from_bytes(_pack_words(
+            t0[x[0]] ^ t1[x[8]] ^ t2[x[16]] ^ t3[x[24]] ^ t4[x[32]] ^ t5[x[40]] ^ t6[x[48]] ^ t7[x[56]],
+            t0[x[1]] ^ t1[x[9]] ^ t2[x[17]] ^ t3[x[25]] ^ t4[x[33]] ^ t5[x[41]] ^ t6[x[49]] ^ t7[x[57]],
+            t0[x[2]] ^ t1[x[10]] ^ t2[x[18]] ^ t3[x[26]] ^ t4[x[34]] ^ t5[x[42]] ^ t6[x[50]] ^ t7[x[58]],
+            t0[x[3]] ^ t1[x[11]] ^ t2[x[19]] ^ t3[x[27]] ^ t4[x[35]] ^ t5[x[43]] ^ t6[x[51]] ^ t7[x[59]],
+            t0[x[4]] ^ t1[x[12]] ^ t2[x[20]] ^ t3[x[28]] ^ t4[x[36]] ^ t5[x[44]] ^ t6[x[52]] ^ t7[x[60]],
+            t0[x[5]] ^ t1[x[13]] ^ t2[x[21]] ^ t3[x[29]] ^ t4[x[37]] ^ t5[x[45]] ^ t6[x[53]] ^ t7[x[61]],
+            t0[x[6]] ^ t1[x[14]] ^ t2[x[22]] ^ t3[x[30]] ^ t4[x[38]] ^ t5[x[46]] ^ t6[x[54]] ^ t7[x[62]],
+            t0[x[7]] ^ t1[x[15]] ^ t2[x[23]] ^ t3[x[31]] ^ t4[x[39]] ^ t5[x[47]] ^ t6[x[55]] ^ t7[x[63]],
+        ), byteorder='big')
+
+    def _E(self, K: int, m: int) -> int:
+        lps = self._lps
         state = m
-        Ks = [K]
-        for i in range(1, 13):
-            Ks.append(self._LPS(bytes(a ^ b for a, b in zip(Ks[i-1], self.constants[i-1]))))
+        for c in self.int_constants:
+            state = lps(state ^ K)
+            K = lps(K ^ c)
+        return state ^ K
 
-        for i in range(12):
-            state = self._LPS(bytes(a ^ b for a, b in zip(state, Ks[i])))
-        return bytes(a ^ b for a, b in zip(state, Ks[-1]))
+    def _round_keys(self, K: int) -> list[int]:
+        keys = [K]
+        for c in self.int_constants:
+            K = self._lps(K ^ c)
+            keys.append(K)
+        return keys
 
-    def _g(self, N, h, m):
-        K = self._LPS(bytes(a ^ b for a, b in zip(h, N)))
-        return bytes(a ^ b ^ c for a, b, c in zip(self._E(K, m), h, m))
+    def _g(self, N: int, h: int, m: int) -> int:
+        if N == 0 and h == self.iv_int:
+            lps = self._lps
+            keys = self.iv_round_keys
+            state = m
+            for i in range(12):
+                state = lps(state ^ keys[i])
+            return state ^ keys[12] ^ h ^ m
+        K = self._lps(h ^ N)
+        return self._E(K, m) ^ h ^ m
 
     def _pad(self, data):
         assert len(data) < 64, "Data block must be less than 64 bytes"
-        padded = bytearray([0] * (64 - len(data) - 1))
+        padded = bytearray(data)
         padded.append(0x01)
-        padded.extend(data)
-        assert len(padded) == 64
+        padded.extend(bytes(64 - len(padded)))
         return bytes(padded)
 
+    def _compress_blocks(self, h: int, N: int, Sigma: int, data) -> tuple[int, int, int]:
+        # Сообщение читается как строка байт: первые 64 байта - младший блок,
+        # который по стандарту сжимается первым, а байт 0 блока - младший байт числа
+        g = self._g
+        for i in range(0, len(data) - 63, 64):
+            block = int.from_bytes(data[i:i + 64], byteorder='little')
+            h = g(N, h, block)
+            N = (N + 512) & _MASK512
+            Sigma = (Sigma + block) & _MASK512
+        return h, N, Sigma
+
+    def _finalize(self, h: int, N: int, Sigma: int, tail) -> bytes:
+        # Остаток короче блока дополняется всегда, даже пустой
+        # (при длине сообщения, кратной 64 байтам)
+        block = int.from_bytes(self._pad(tail), byteorder='little')
+        h = self._g(N, h, block)
+
+        N = (N + len(tail) * 8) & _MASK512
+        Sigma = (Sigma + block) & _MASK512
+
+        h = self._g(0, self._g(0, h, N), Sigma)
+        return h.to_bytes(64, byteorder='little')[64 - self.hash_size // 8:]
+
+    def new(self, data=b'', length=None):
+        return GOST341112Hash(self, data, length)
+
     def hash(self, data: bytes):
-        h = self._get_iv()
-        N = Sigma = bytes(64)
-        
-        first_block_size = len(data) % 64 or 64
-        remaining_data = data[first_block_size:]
-        
-        for i in range(0, len(remaining_data), 64):
-            block = remaining_data[i:i + 64]
-            h = self._g(N, h, block)
-            N = ((int.from_bytes(N, byteorder='big') + 512) % (2**512)).to_bytes(64, byteorder='big')
-            Sigma = ((int.from_bytes(Sigma, byteorder='big') + int.from_bytes(block, byteorder='big')) % (2**512)).to_bytes(64, byteorder='big')
-        
-        first_block = data[:first_block_size]
-        padded_block = first_block if len(first_block) == 64 else self._pad(first_block)
-        h = self._g(N, h, padded_block)
-        
-        N = ((int.from_bytes(N, byteorder='big') + (512 if len(first_block) == 64 else len(first_block) * 8)) % (2**512)).to_bytes(64, byteorder='big')
-        Sigma = ((int.from_bytes(Sigma, byteorder='big') + int.from_bytes(padded_block, byteorder='big')) % (2**512)).to_bytes(64, byteorder='big')
-        
-        return self._g(bytes(64), self._g(bytes(64), h, N), Sigma)[:(self.hash_size // 8)]
-    
-def main():
-    hasher = GOST341112(hash_size=512)
-
-   
-    with open('test.txt', 'rb') as f:
-        data = f.read()
-        
-    hash_value = hasher.hash(data).hex()
-
-    hash_file = Path('test.txt').with_suffix('.hash')
-    hash_file.write_text(hash_value)
-    print(f"Хэш: {hash_value}")
-            
+        return self.new(data, length=len(data)).digest()
+
+
+class GOST341112Hash:
+    """
+    Потоковый хэш в интерфейсе hashlib: update / digest / hexdigest / copy.
+
+    Полные 64-байтные блоки сжимаются по мере поступления, так что объект
+    хранит не больше одного неполного блока независимо от длины сообщения.
+    Необязательная length только проверяет, что данных пришло ровно столько.
+    """
+    block_size = 64
+
+    def __init__(self, hasher: GOST341112, data=b'', length=None):
+        self._hasher = hasher
+        self.digest_size = hasher.hash_size // 8
+        self.name = f"streebog{hasher.hash_size}"
+        self._length = length
+        self._received = 0
+        self._buffer = bytearray()
+        self._h = hasher.iv_int
+        self._N = 0
+        self._Sigma = 0
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        view = memoryview(data).cast('B')
+        if self._length is not None and self._received + len(view) > self._length:
+            raise ValueError("Данных больше, чем указано в length")
+        self._received += len(view)
+
+        if self._buffer:
+            take = 64 - len(self._buffer)
+            self._buffer.extend(view[:take])
+            view = view[take:]
+            if len(self._buffer) < 64:
+                return
+            self._h, self._N, self._Sigma = self._hasher._compress_blocks(
+                self._h, self._N, self._Sigma, self._buffer
+            )
+            self._buffer.clear()
+
+        full = len(view) - len(view) % 64
+        if full:
+            self._h, self._N, self._Sigma = self._hasher._compress_blocks(
+                self._h, self._N, self._Sigma, view[:full]
+            )
+        self._buffer.extend(view[full:])
+
+    def digest(self) -> bytes:
+        if self._length is not None and self._received != self._length:
+            raise ValueError(f"Получено {self._received} байт из {self._length}")
+        return self._hasher._finalize(self._h, self._N, self._Sigma, bytes(self._buffer))
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self) -> "GOST341112Hash":
+        other = object.__new__(GOST341112Hash)
+        other.__dict__.update(self.__dict__)
+        other._buffer = self._buffer.copy()
+        return other
+
+
+class HMACGOST341112:
+    """
+    HMAC_GOSTR3411_2012_256/512 по Р 50.1.113-2016.
+
+    Блоки K ^ ipad и K ^ opad идут первыми в сообщениях внутреннего и внешнего
+    хэша, поэтому объект сжимает их один раз и хранит состояния (h, N, Sigma)
+    после них. Для каждого сообщения копируются готовые состояния, так что
+    объект стоит создавать один раз на ключ и переиспользовать.
+    """
+
+    def __init__(self, key: bytes, hash_size=512, hasher: GOST341112 = None):
+        self._hasher = hasher or GOST341112(hash_size=hash_size)
+        self.digest_size = self._hasher.hash_size // 8
+        self.block_size = 64
+        self.name = f"hmac-streebog{self._hasher.hash_size}"
+        if len(key) > 64:
+            key = self._hasher.hash(key)
+        key = key.ljust(64, b'\x00')
+        self._inner = self._hasher.new(bytes(b ^ 0x36 for b in key))
+        self._outer_state = self._hasher.new(bytes(b ^ 0x5c for b in key))
+
+    def new(self, data=b'', length=None) -> "HMACGOST341112Hash":
+        return HMACGOST341112Hash(self, data, length)
+
+    def digest(self, message: bytes) -> bytes:
+        return self.new(message, length=len(message)).digest()
+
+    def hexdigest(self, message: bytes) -> str:
+        return self.digest(message).hex()
+
+    def _outer(self, inner_digest: bytes) -> bytes:
+        outer = self._outer_state.copy()
+        outer.update(inner_digest)
+        return outer.digest()
+
+
+class HMACGOST341112Hash:
+    """
+    Потоковый HMAC в интерфейсе hmac/hashlib поверх GOST341112Hash.
+    """
+
+    def __init__(self, hmac: HMACGOST341112, data=b'', length=None):
+        self._hmac = hmac
+        self.digest_size = hmac.digest_size
+        self.block_size = hmac.block_size
+        self.name = hmac.name
+        self._inner = hmac._inner.copy()
+        if length is not None:
+            self._inner._length = 64 + length
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        self._inner.update(data)
+
+    def digest(self) -> bytes:
+        return self._hmac._outer(self._inner.digest())
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self) -> "HMACGOST341112Hash":
+        other = object.__new__(HMACGOST341112Hash)
+        other.__dict__.update(self.__dict__)
+        other._inner = self._inner.copy()
+        return other
+
+
+def pbkdf2(password: bytes, salt: bytes, iterations: int, dklen: int = 64, hash_size=512) -> bytes:
+    """
+    PBKDF2 по Р 50.1.111-2016 на основе HMAC_GOSTR3411_2012.
+
+    Ключ пароля подготавливается один раз и используется во всех итерациях.
+    """
+    if iterations < 1:
+        raise ValueError("Число итераций должно быть положительным")
+    hmac = HMACGOST341112(password, hash_size=hash_size)
+    blocks = []
+    for i in range(1, -(-dklen // hmac.digest_size) + 1):
+        u = hmac.digest(salt + i.to_bytes(4, byteorder='big'))
+        t = int.from_bytes(u, byteorder='big')
+        for _ in range(iterations - 1):
+            u = hmac.digest(u)
+            t ^= int.from_bytes(u, byteorder='big')
+        blocks.append(t.to_bytes(hmac.digest_size, byteorder='big'))
+    return b''.join(blocks)[:dklen]
+
+
+def hash_fileobj(hasher: GOST341112, f) -> bytes:
+    """
+    Хэширует открытый бинарный файл с текущей позиции до конца; после вызова
+    позиция стоит в конце файла. Обычные файлы читаются через mmap без
+    копирования в память, прочие потоки (io.BytesIO, pipe, stdin) - кусками.
+    """
+    try:
+        fd = f.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        fd = None
+    if fd is None or not stat.S_ISREG(os.fstat(fd).st_mode):
+        return _hash_stream(hasher, f)
+
+    start = f.tell()
+    size = os.fstat(fd).st_size
+    f.seek(0, os.SEEK_END)
+    if start >= size:
+        return hasher.hash(b'')
+
+    h = hasher.new(length=size - start)
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            # Окна выровнены по страницам, чтобы их можно было отдать через madvise
+            for window in range(start - start % mmap.PAGESIZE, size, _MMAP_WINDOW):
+                h.update(view[max(window, start):window + _MMAP_WINDOW])
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_DONTNEED, window, min(_MMAP_WINDOW, size - window))
+        finally:
+            view.release()
+    return h.digest()
+
+
+def _hash_stream(hasher: GOST341112, f) -> bytes:
+    h = hasher.new()
+    while chunk := f.read(_MMAP_WINDOW):
+        h.update(chunk)
+    return h.digest()
+
+
+def hash_file(hasher: GOST341112, path) -> bytes:
+    with open(path, 'rb') as f:
+        return hash_fileobj(hasher, f)
+
+
+def _sidecar(path) -> Path:
+    # Суффикс добавляется к полному имени, чтобы f.txt и f.bin не делили f.hash
+    return Path(f"{path}.hash")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Хэширование файлов по ГОСТ 34.11-2012 (Стрибог)")
+    parser.add_argument('paths', nargs='*', default=['-'], help="Файлы для хэширования, '-' - stdin")
+    parser.add_argument('--size', type=int, choices=(256, 512), default=512, help="Размер хэша в битах")
+    parser.add_argument('--check', action='store_true', help="Сверить хэши с соседними файлами <путь>.hash")
+    parser.add_argument('--write', action='store_true', help="Записать хэш в соседний файл <путь>.hash")
+    parser.add_argument('--throughput', action='store_true', help="Вывести скорость хэширования в stderr")
+    args = parser.parse_args(argv)
+    if args.check and '-' in args.paths:
+        parser.error("--check требует путь к файлу")
+
+    hasher = GOST341112(hash_size=args.size)
+    failed = 0
+    total_bytes = 0
+    total_time = 0.0
+
+    for path in args.paths:
+        if args.check:
+            try:
+                expected = _sidecar(path).read_text().strip().lower()
+            except OSError:
+                failed += 1
+                print(f"{path}: MISSING")
+                continue
+
+        started = time.perf_counter()
+        if path == '-':
+            hash_value = hash_fileobj(hasher, sys.stdin.buffer).hex()
+            size = None
+        else:
+            hash_value = hash_file(hasher, path).hex()
+            size = os.path.getsize(path)
+        elapsed = time.perf_counter() - started
+
+        if args.check:
+            ok = expected == hash_value
+            failed += not ok
+            print(f"{path}: {'OK' if ok else 'FAILED'}")
+        else:
+            print(f"{hash_value}  {path}")
+
+        if args.write and path != '-':
+            _sidecar(path).write_text(hash_value)
+
+        if args.throughput and size is not None:
+            total_bytes += size
+            total_time += elapsed
+            print(f"{path}: {size} байт за {elapsed:.3f} с, {size / elapsed / 1024:.1f} КБ/с", file=sys.stderr)
+
+    if args.throughput and len(args.paths) > 1 and total_time > 0:
+        print(f"Итого: {total_bytes} байт, {total_bytes / total_time / 1024:.1f} КБ/с", file=sys.stderr)
+
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from .lib.curve import EllipticCurve, FixedBaseTable, Point
+
+# Сколько горячих ключей с таблицами кратных помещается в кэш по умолчанию
+DEFAULT_HOT_KEYS = 2048
+
+
+class KeyContext:
+    __slots__ = ("point", "table", "uses", "size", "valid")
+
+    def __init__(self, point: Point, valid: bool = True):
+        """
+        Контекст проверки для одного открытого ключа
+
+        :param: point: Распакованная точка Q
+        :param: valid: False для точек малого порядка: подписи с таким ключом не проверяются
+        """
+        self.point = point
+        self.valid = valid
+        self.table = None
+        self.uses = 0
+        self.size = _deep_sizeof((point.x, point.y))
+
+    def multiply_jacobian(self, n: int) -> tuple[int, int, int]:
+        """
+        Вычисляет n * Q в координатах Якоби, используя таблицу кратных, если она уже построена
+        """
+        if self.table is not None:
+            return self.table.multiply_jacobian(n)
+        return self.point._mul_jacobian(n)
+
+
+class PublicKeyCache:
+    def __init__(
+        self,
+        curve: EllipticCurve,
+        bits: int,
+        max_bytes: int = None,
+        window: int = 4,
+        table_after: int = 4,
+        hot_keys: int = DEFAULT_HOT_KEYS,
+        cofactor: int = 1,
+    ):
+        """
+        LRU-кэш распакованных открытых ключей с таблицами кратных для горячих ключей.
+
+        Ключ распаковывается при первом обращении, а таблица кратных строится, когда
+        число проверок с этим ключом достигает table_after: для разовых ключей
+        построение таблицы дороже самой проверки. При превышении max_bytes
+        вытесняются давно не использованные ключи. Точки малого порядка (h * Q = O
+        для кофактора h) помечаются недействительными сразу при распаковке, и
+        таблица для них не строится.
+
+        Таблица с окном 4 занимает около 180 КБ для 256-битных ключей и около
+        500 КБ для 512-битных, поэтому по умолчанию max_bytes рассчитывается
+        так, чтобы вместить hot_keys ключей с таблицами: примерно 370 МБ и 1 ГБ
+        при hot_keys = 2048.
+
+        :param: curve: Кривая, на которой лежат ключи
+        :param: bits: Битовая длина скаляров (порядка подгруппы)
+        :param: max_bytes: Ограничение на оценочный объем памяти кэша
+        :param: window: Ширина окна таблицы кратных
+        :param: table_after: Число проверок, после которого для ключа строится таблица
+        :param: hot_keys: Число ключей с таблицами, под которое рассчитывается max_bytes по умолчанию
+        :param: cofactor: Кофактор кривой m / q
+        """
+        self.curve = curve
+        self.bits = bits
+        self.cofactor = cofactor
+        if max_bytes is None:
+            max_bytes = hot_keys * entry_footprint(curve, bits, window)
+        self.max_bytes = max_bytes
+        self.window = window
+        self.table_after = table_after
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        # Ключи хранятся в байтах, чтобы строковый и байтовый API делили записи
+        self._entries: OrderedDict[bytes, KeyContext] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, public_key: str | bytes | memoryview, uses: int = 1) -> KeyContext:
+        """
+        Возвращает контекст ключа, распаковывая его при промахе
+
+        :param: public_key: Сжатый открытый ключ в виде шестнадцатеричной строки или байтов
+        :param: uses: Сколько проверок будет выполнено с этим ключом
+        :return: Контекст ключа
+        """
+        public_key = _key_bytes(public_key)
+        with self._lock:
+            context = self._entries.get(public_key)
+            if context is not None:
+                self.hits += 1
+                self._entries.move_to_end(public_key)
+            else:
+                self.misses += 1
+
+        if context is None:
+            point = Point.uncompress_bytes(self.curve, public_key)
+            small_order = self.cofactor > 1 and (self.cofactor * point).x is None
+            fresh = KeyContext(point, valid=not small_order)
+            with self._lock:
+                context = self._entries.setdefault(public_key, fresh)
+                if context is fresh:
+                    self.size += context.size
+
+        context.uses += uses
+        if context.valid and context.table is None and context.uses >= self.table_after:
+            try:
+                table = FixedBaseTable(context.point, self.bits, self.window)
+            except ValueError:
+                # Кратные точки попали в бесконечность: ключ не годится для проверки
+                context.valid = False
+                table = None
+            if table is not None:
+                table_size = _deep_sizeof(table.table)
+                with self._lock:
+                    if context.table is None:
+                        context.table = table
+                        context.size += table_size
+                        if public_key in self._entries:
+                            self.size += table_size
+
+        self._evict()
+        return context
+
+    def _evict(self):
+        with self._lock:
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, context = self._entries.popitem(last=False)
+                self.size -= context.size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        :return: Статистика кэша: попадания, промахи, вытеснения, число ключей и объем
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "tables": sum(1 for c in self._entries.values() if c.table is not None),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, public_key: str | bytes | memoryview) -> bool:
+        return _key_bytes(public_key) in self._entries
+
+
+def entry_footprint(curve: EllipticCurve, bits: int, window: int = 4) -> int:
+    """
+    Оценка объема записи кэша с таблицей кратных, без построения самой таблицы
+
+    :param: curve: Кривая, на которой лежат ключи
+    :param: bits: Битовая длина скаляров
+    :param: window: Ширина окна таблицы кратных
+    :return: Оценочный объем в байтах, в тех же единицах, что и PublicKeyCache.size
+    """
+    count = (1 << window) - 1
+    rows = -(-bits // window)
+    point = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(curve.p)
+    row = sys.getsizeof([None] * count) + count * point
+    return point + sys.getsizeof([None] * rows) + rows * row
+
+
+def _key_bytes(public_key: str | bytes | memoryview) -> bytes:
+    return bytes.fromhex(public_key) if isinstance(public_key, str) else bytes(public_key)
+
+
+def _deep_sizeof(obj) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        size += sum(_deep_sizeof(item) for item in obj)
+    return size
@@ -1,20 +1,31 @@
+import json
+import os
+import tempfile
 from typing import Self
 
 
+SCALAR_MULT_METHODS = ("binary", "wnaf", "ladder")
+
+
 class EllipticCurve:
-    def __init__(self, a: int, b: int, p: int):
+    def __init__(self, a: int, b: int, p: int, scalar_mult: str = "binary"):
         """
         Создает эллиптическую кривую в формк y^2 = x^3 + ax + b (mod p)
 
         :param a: Коэффицент a
         :param b: Коэффицент b
         :param p: Простой модуль конечного поля
+        :param scalar_mult: Способ умножения точки на скаляр по умолчанию:
+            "binary" (удвоение-сложение), "wnaf" или "ladder" (лесенка Монтгомери)
         """
         if (4 * a**3 + 27 * b**2) % p == 0:
             raise ValueError("The curve is singular, choose different a and b.")
+        if scalar_mult not in SCALAR_MULT_METHODS:
+            raise ValueError(f"Unknown scalar multiplication method: {scalar_mult}.")
         self.a = a
         self.b = b
         self.p = p
+        self.scalar_mult = scalar_mult
         self.j_invariant = self.calculate_j_invariant()
 
     def calculate_j_invariant(self) -> int:
@@ -58,7 +69,65 @@ class EllipticCurve:
         return f"EllipticCurve(a={self.a}, b={self.b}, p={self.p})"
 
 
+class TwistedEdwardsCurve:
+    def __init__(self, e: int, d: int, p: int):
+        """
+        Скрученная кривая Эдвардса e*u^2 + v^2 = 1 + d*u^2*v^2 (mod p).
+
+        Кривая бирационально эквивалентна кривой Вейерштрасса с
+        a = s^2 - 3t^2, b = 2t^3 - ts^2, где s = (e - d) / 4, t = (e + d) / 6:
+        x = s(1 + v) / (1 - v) + t, y = s(1 + v) / ((1 - v)u).
+
+        :param e: Коэффицент e
+        :param d: Коэффицент d
+        :param p: Простой модуль конечного поля
+        """
+        if e * d * (e - d) % p == 0:
+            raise ValueError("The Edwards curve is singular, choose different e and d.")
+        self.e = e % p
+        self.d = d % p
+        self.p = p
+        self.s = (e - d) * pow(4, -1, p) % p
+        self.t = (e + d) * pow(6, -1, p) % p
+
+    def is_point_on_curve(self, u: int, v: int) -> bool:
+        return (self.e * u * u + v * v - 1 - self.d * u * u * v * v) % self.p == 0
+
+    def to_weierstrass(self, scalar_mult: str = "binary") -> EllipticCurve:
+        """
+        :return: Эквивалентная кривая в форме Вейерштрасса
+        """
+        s, t, p = self.s, self.t, self.p
+        return EllipticCurve((s * s - 3 * t * t) % p, (2 * t**3 - t * s * s) % p, p, scalar_mult)
+
+    def point_to_weierstrass(self, u: int, v: int) -> tuple[int, int]:
+        """
+        Переводит аффинную точку (u, v) кривой Эдвардса в точку (x, y) кривой Вейерштрасса.
+        Нейтральная точка (0, 1) и точка второго порядка (0, -1) не отображаются
+        """
+        p = self.p
+        if u == 0:
+            raise ValueError("The point has no affine image on the Weierstrass curve.")
+        w = self.s * (1 + v) * pow((1 - v) * u, -1, p) % p
+        return ((w * u + self.t) % p, w)
+
+    def point_from_weierstrass(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Обратное отображение: точка (x, y) кривой Вейерштрасса в точку (u, v) кривой Эдвардса
+        """
+        p = self.p
+        x1 = (x - self.t) % p
+        if y == 0 or (x1 + self.s) % p == 0:
+            raise ValueError("The point has no affine image on the Edwards curve.")
+        return (x1 * pow(y, -1, p) % p, (x1 - self.s) * pow(x1 + self.s, -1, p) % p)
+
+    def __str__(self) -> str:
+        return f"TwistedEdwardsCurve(e={self.e}, d={self.d}, p={self.p})"
+
+
 class Point:
+    __slots__ = ("curve", "x", "y")
+
     def __init__(self, curve: EllipticCurve, x: int, y: int):
         """
         Новая точка на эллиптической кривой
@@ -76,13 +145,25 @@ class Point:
             if not curve.is_point_on_curve(x, y):
                 raise ValueError("The point is not on the given curve.")
 
+    @classmethod
+    def _trusted(cls, curve: EllipticCurve, x: int, y: int) -> Self:
+        """
+        Создает точку без проверки принадлежности кривой.
+        Только для результатов арифметики над уже проверенными точками
+        """
+        point = object.__new__(cls)
+        point.curve = curve
+        point.x = x
+        point.y = y
+        return point
+
     def order(self) -> int:
         """
         Вычисляет порядок точки (минимальное n такое, что n * P = O).
 
         :return: Порядок точки
         """
-        current = Point(self.curve, None, None)
+        current = Point._trusted(self.curve, None, None)
         n = 1
 
         while True:
@@ -95,15 +176,17 @@ class Point:
         """
         Возращает строковое представление сжатой точки
 
-        :return: 16-ричная строка длины 64
+        :return: 16-ричная строка: байт четности y и x длиной в байтовую длину p
+        """
+        return self.compress_bytes().hex()
+
+    def compress_bytes(self) -> bytes:
         """
-        bx = bytes.fromhex(hex(self.x)[2:].zfill(64))
-        by = bytes.fromhex(hex(self.y)[2:].zfill(64))
-        y = 2 + (by[-1] & 1)
-        out = bytearray(len(bx) + 1)
-        out[0] = y
-        out[1:] = bx
-        return out.hex()
+        Сжатая точка в байтах: 0x02 или 0x03 по четности y, затем x фиксированной длины
+
+        :return: Байты длины 1 + байтовая длина p
+        """
+        return bytes((2 + (self.y & 1),)) + self.x.to_bytes((self.curve.p.bit_length() + 7) // 8)
 
     @classmethod
     def uncompress(self, curve: EllipticCurve, compressed: str) -> Self:
@@ -112,12 +195,30 @@ class Point:
 
         :return: Point(curve, x, y)
         """
-        compressed_bytes = bytes.fromhex(compressed)
-        sign_y = compressed_bytes[0] - 2
-        x = int.from_bytes(compressed_bytes[1:], byteorder="big")
+        return Point.uncompress_bytes(curve, bytes.fromhex(compressed))
+
+    @classmethod
+    def uncompress_bytes(cls, curve: EllipticCurve, compressed: bytes | memoryview) -> Self:
+        """
+        То же, что uncompress, для сжатой точки в байтах
+
+        :return: Point(curve, x, y)
+        """
+        if not compressed:
+            raise ValueError("The compressed point is empty.")
+        sign_y = compressed[0] - 2
+        x = int.from_bytes(compressed[1:], byteorder="big")
+        if sign_y not in (0, 1) or x >= curve.p:
+            raise ValueError("The point is not on the given curve.")
 
         rhs = (x**3 + curve.a * x + curve.b) % curve.p
 
+        if rhs == 0:
+            # Точка второго порядка (x, 0): корень единственный и четный
+            if sign_y:
+                raise ValueError("The point is not on the given curve.")
+            return Point(curve, x, 0)
+
         if pow(rhs, (curve.p - 1) // 2, curve.p) != 1:
             raise ValueError("The point is not on the given curve.")
 
@@ -135,7 +236,7 @@ class Point:
         """
         if self.x is None or self.y is None:  # точка на бесконечности
             return self
-        return Point(self.curve, self.x, (-self.y) % self.curve.p)
+        return Point._trusted(self.curve, self.x, (-self.y) % self.curve.p)
 
     def __add__(self, other):
         """
@@ -155,9 +256,9 @@ class Point:
         if other.x is None and other.y is None:
             return self
 
-        if self.x == other.x and self.y != other.y:
-            # P + (-P) = O (точка на бесконечности)
-            return Point(self.curve, None, None)
+        if self.x == other.x and (self.y != other.y or self.y == 0):
+            # P + (-P) = O (точка на бесконечности), в том числе P + P при y = 0
+            return Point._trusted(self.curve, None, None)
 
         if self.x == other.x:
             slope = (3 * self.x**2 + self.curve.a) * pow(2 * self.y, -1, self.curve.p)
@@ -169,24 +270,148 @@ class Point:
         x_r = (slope**2 - self.x - other.x) % self.curve.p
         y_r = (slope * (self.x - x_r) - self.y) % self.curve.p
 
-        return Point(self.curve, x_r, y_r)
+        return Point._trusted(self.curve, x_r, y_r)
 
     def __rmul__(self, n: int):
         """
-        Скалярное произведение числа на точку
+        Скалярное произведение числа на точку способом, выбранным для кривой.
+        Считается в координатах Якоби без обращений, в аффинные переводится один раз в конце
         :param n: Скаляр
         :return: Новая точка n * P
         """
-        result = Point(self.curve, None, None)
-        temp = self
+        return _jacobian_to_point(self.curve, self._mul_jacobian(n))
 
-        while n > 0:
-            if n % 2 == 1:
-                result += temp
-            temp += temp
-            n //= 2
+    def multiply(self, n: int, method: str = None, window: int = 4) -> "Point":
+        """
+        Скалярное произведение с явным выбором способа
+        :param n: Скаляр
+        :param method: "binary", "wnaf" или "ladder", по умолчанию - способ кривой
+        :param window: Ширина окна для wNAF
+        :return: Новая точка n * P
+        """
+        return _jacobian_to_point(self.curve, self._mul_jacobian(n, method, window))
+
+    def _mul_jacobian(self, n: int, method: str = None, window: int = 4) -> tuple[int, int, int]:
+        method = method or self.curve.scalar_mult
+        if n <= 0 or self.x is None or self.y is None:
+            return (1, 1, 0)
+        if method == "wnaf":
+            return self._mul_wnaf(n, window)
+        if method == "ladder":
+            return self._mul_ladder(n)
+        if method != "binary":
+            raise ValueError(f"Unknown scalar multiplication method: {method}.")
+
+        a, p = self.curve.a, self.curve.p
+        x, y = self.x, self.y
+        R = (x, y, 1)
+        for bit in bin(n)[3:]:
+            R = _jacobian_double(R, a, p)
+            if bit == "1":
+                R = _jacobian_add_affine(R, x, y, a, p)
+        return R
+
+    def _mul_wnaf(self, n: int, window: int) -> tuple[int, int, int]:
+        """
+        Умножение по w-NAF: ненулевые цифры нечетны, по модулю меньше 2^(w-1) и
+        разделены не менее чем w - 1 нулями, поэтому сложений около bits / (w + 1).
+        Нечетные кратные P, 3P, ..., (2^(w-1) - 1)P хранятся в аффинных координатах,
+        а вычитание - это сложение с точкой (x, -y)
+        """
+        a, p = self.curve.a, self.curve.p
+        base = (self.x, self.y, 1)
+        double = _jacobian_double(base, a, p)
+        odd = [base]
+        for _ in range((1 << (window - 2)) - 1):
+            odd.append(_jacobian_add(odd[-1], double, a, p))
+        if double[2] == 0 or any(Z == 0 for _, _, Z in odd):
+            return self._mul_jacobian(n, "binary")
+        table = _jacobian_to_affine_batch(odd, p)
+
+        R = (1, 1, 0)
+        for digit in reversed(_wnaf(n, window)):
+            R = _jacobian_double(R, a, p)
+            if digit > 0:
+                x, y = table[digit >> 1]
+                R = _jacobian_add_affine(R, x, y, a, p)
+            elif digit < 0:
+                x, y = table[-digit >> 1]
+                R = _jacobian_add_affine(R, x, -y % p, a, p)
+        return R
+
+    def _mul_ladder(self, n: int) -> tuple[int, int, int]:
+        """
+        Лесенка Монтгомери: на каждом бите ровно одно сложение и одно удвоение,
+        а число шагов не меньше битовой длины p, так что последовательность
+        операций не зависит от значения скаляра
+        """
+        a, p = self.curve.a, self.curve.p
+        R0 = (1, 1, 0)
+        R1 = (self.x, self.y, 1)
+        for i in range(max(n.bit_length(), p.bit_length()) - 1, -1, -1):
+            if (n >> i) & 1:
+                R0 = _jacobian_add(R0, R1, a, p)
+                R1 = _jacobian_double(R1, a, p)
+            else:
+                R1 = _jacobian_add(R0, R1, a, p)
+                R0 = _jacobian_double(R0, a, p)
+        return R0
 
-        return result
+    @staticmethod
+    def multi_scalar(pairs: list[tuple[int, "Point"]], window: int = 4) -> "Point":
+        """
+        Вычисляет n1 * P1 + n2 * P2 + ... одной общей цепочкой удвоений (метод Штрауса).
+        Для каждой точки строится таблица 1..2^window - 1 кратных, а на каждом окне
+        после window удвоений добавляется по одной табличной точке на слагаемое
+        :param: pairs: Список пар (скаляр, точка) на одной кривой
+        :param: window: Ширина окна в битах
+        :return: Новая точка, сумма n_i * P_i
+        """
+        terms = []
+        for n, point in pairs:
+            if n < 0:
+                n, point = -n, -point
+            if n and point.x is not None:
+                terms.append((n, point))
+        if not terms:
+            return Point._trusted(pairs[0][1].curve, None, None)
+
+        curve = terms[0][1].curve
+        if any(point.curve != curve for _, point in terms):
+            raise ValueError("Points must be on the same curve.")
+        a, p = curve.a, curve.p
+        count = (1 << window) - 1
+
+        jacobian = []
+        for _, point in terms:
+            base = (point.x, point.y, 1)
+            row = [base]
+            for _ in range(count - 1):
+                row.append(_jacobian_add(row[-1], base, a, p))
+            jacobian.extend(row)
+        if any(Z == 0 for _, _, Z in jacobian):
+            # Малый порядок точки: таблица содержит бесконечность, считаем по отдельности
+            # в координатах Якоби, где удвоение точки с y = 0 дает бесконечность
+            R = (1, 1, 0)
+            for n, point in terms:
+                R = _jacobian_add(R, point._mul_jacobian(n), a, p)
+            return _jacobian_to_point(curve, R)
+        affine = _jacobian_to_affine_batch(jacobian, p)
+        tables = [affine[i:i + count] for i in range(0, len(affine), count)]
+
+        windows = -(-max(n.bit_length() for n, _ in terms) // window)
+        R = (1, 1, 0)
+        for i in range(windows - 1, -1, -1):
+            if R[2]:
+                for _ in range(window):
+                    R = _jacobian_double(R, a, p)
+            shift = i * window
+            for (n, _), table in zip(terms, tables):
+                digit = (n >> shift) & count
+                if digit:
+                    R = _jacobian_add_affine(R, *table[digit - 1], a, p)
+
+        return _jacobian_to_point(curve, R)
 
     def __repr__(self) -> str:
         if self.x is None or self.y is None:
@@ -229,3 +454,432 @@ class Point:
             m, c, t, r = i, pow(b, 2, p), (t * b * b) % p, (r * b) % p
 
         return r
+
+
+
+def _write_json_atomic(path, data):
+    """
+    Пишет JSON во временный файл рядом с path и атомарно подменяет им path,
+    чтобы падение или параллельная запись не оставили обрезанный файл
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class FixedBaseTable:
+    def __init__(self, point: Point, bits: int, window: int = 8, table=None):
+        """
+        Таблица кратных фиксированной точки для умножения без удвоений.
+
+        Скаляр разбивается на окна по window бит, и для каждого окна i хранятся
+        аффинные точки j * 2^(window * i) * P, j = 1..2^window - 1. Тогда n * P
+        складывается из bits / window табличных точек.
+
+        :param: point: Фиксированная точка P
+        :param: bits: Максимальная битовая длина скаляра
+        :param: window: Ширина окна в битах
+        :param: table: Готовая таблица (при загрузке из файла)
+        """
+        self.point = point
+        self.curve = point.curve
+        self.bits = bits
+        self.window = window
+        self.table = table if table is not None else self._build()
+
+    def _build(self) -> list[list[tuple[int, int]]]:
+        a, p = self.curve.a, self.curve.p
+        count = (1 << self.window) - 1
+        jacobian = []
+        base = (self.point.x, self.point.y, 1)
+        for _ in range(-(-self.bits // self.window)):
+            row = [base]
+            for _ in range(count - 1):
+                row.append(_jacobian_add(row[-1], base, a, p))
+            jacobian.extend(row)
+            base = _jacobian_add(row[-1], base, a, p)
+        affine = _jacobian_to_affine_batch(jacobian, p)
+        return [affine[i:i + count] for i in range(0, len(affine), count)]
+
+    def multiply(self, n: int) -> Point:
+        """
+        Умножение фиксированной точки на скаляр одними смешанными сложениями
+        :param n: Скаляр
+        :return: Новая точка n * P
+        """
+        return _jacobian_to_point(self.curve, self.multiply_jacobian(n))
+
+    def multiply_jacobian(self, n: int) -> tuple[int, int, int]:
+        """
+        То же, что multiply, но без перевода результата в аффинные координаты
+        :param n: Скаляр
+        :return: Точка n * P в координатах Якоби (X, Y, Z)
+        """
+        if n <= 0 or n.bit_length() > self.bits:
+            return self.point._mul_jacobian(n)
+        a, p = self.curve.a, self.curve.p
+        mask = (1 << self.window) - 1
+        R = (1, 1, 0)
+        for row in self.table:
+            digit = n & mask
+            if digit:
+                R = _jacobian_add_affine(R, *row[digit - 1], a, p)
+            n >>= self.window
+            if not n:
+                break
+        return R
+
+    def save(self, path):
+        """
+        Сохраняет таблицу в JSON-файл, чтобы не строить ее при каждом запуске
+        """
+        data = {
+            "x": hex(self.point.x),
+            "y": hex(self.point.y),
+            "bits": self.bits,
+            "window": self.window,
+            "table": [[f"{x:x}:{y:x}" for x, y in row] for row in self.table],
+        }
+        _write_json_atomic(path, data)
+
+    @classmethod
+    def load(cls, point: Point, path) -> Self:
+        """
+        Загружает таблицу, сохраненную методом save, для той же точки point
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if int(data["x"], 16) != point.x or int(data["y"], 16) != point.y:
+            raise ValueError("The table was built for a different point.")
+        if data.get("model", "weierstrass") != "weierstrass":
+            raise ValueError("The table was built for an Edwards curve.")
+        table = [
+            [tuple(int(c, 16) for c in entry.split(":")) for entry in row]
+            for row in data["table"]
+        ]
+        # Файл - внешняя граница: точки из него дальше используются без проверок
+        for row in table:
+            for x, y in row:
+                if not point.curve.is_point_on_curve(x, y):
+                    raise ValueError("The table contains a point that is not on the curve.")
+        return cls(point, data["bits"], data["window"], table)
+
+
+class EdwardsFixedBaseTable:
+    def __init__(self, point: Point, edwards: TwistedEdwardsCurve, bits: int, window: int = 8, table=None):
+        """
+        Таблица кратных фиксированной точки, построенная на эквивалентной кривой Эдвардса.
+
+        Интерфейс тот же, что у FixedBaseTable: точки на входе и выходе лежат на кривой
+        Вейерштрасса, но сложения выполняются по единым формулам Эдвардса в расширенных
+        координатах (X : Y : T : Z), которые дешевле сложения в координатах Якоби и не
+        требуют отдельного случая для удвоения. Табличные точки хранятся как
+        (u, v, d*u*v), чтобы сложение с ними не умножало на d.
+
+        :param: point: Фиксированная точка P на кривой Вейерштрасса
+        :param: edwards: Кривая Эдвардса, эквивалентная кривой точки
+        :param: bits: Максимальная битовая длина скаляра
+        :param: window: Ширина окна в битах
+        :param: table: Готовая таблица (при загрузке из файла)
+        """
+        self.point = point
+        self.curve = point.curve
+        self.edwards = edwards
+        self.bits = bits
+        self.window = window
+        self.table = table if table is not None else self._build()
+
+    def _build(self) -> list[list[tuple[int, int, int]]]:
+        e, d, p = self.edwards.e, self.edwards.d, self.edwards.p
+        count = (1 << self.window) - 1
+        u, v = self.edwards.point_from_weierstrass(self.point.x, self.point.y)
+        base = (u, v, u * v % p, 1)
+        extended = []
+        for _ in range(-(-self.bits // self.window)):
+            row = [base]
+            for _ in range(count - 1):
+                row.append(_edwards_add(row[-1], base, e, d, p))
+            extended.extend(row)
+            base = _edwards_add(row[-1], base, e, d, p)
+        affine = _edwards_to_affine_batch(extended, p)
+        table = [(u, v, d * u * v % p) for u, v in affine]
+        return [table[i:i + count] for i in range(0, len(table), count)]
+
+    def multiply(self, n: int) -> Point:
+        """
+        Умножение фиксированной точки на скаляр
+        :param n: Скаляр
+        :return: Новая точка n * P на кривой Вейерштрасса
+        """
+        return _jacobian_to_point(self.curve, self.multiply_jacobian(n))
+
+    def multiply_jacobian(self, n: int) -> tuple[int, int, int]:
+        """
+        Считает n * P на кривой Эдвардса и переводит результат в координаты Якоби
+        кривой Вейерштрасса без обращения
+        :param n: Скаляр
+        :return: Точка n * P в координатах Якоби (X, Y, Z)
+        """
+        if n <= 0 or n.bit_length() > self.bits:
+            return self.point._mul_jacobian(n)
+        e, p = self.edwards.e, self.edwards.p
+        mask = (1 << self.window) - 1
+        R = (0, 1, 0, 1)
+        for row in self.table:
+            digit = n & mask
+            if digit:
+                R = _edwards_add_affine(R, *row[digit - 1], e, p)
+            n >>= self.window
+            if not n:
+                break
+        return _edwards_to_jacobian(self.edwards, R)
+
+    def save(self, path):
+        """
+        Сохраняет таблицу в JSON-файл в том же формате, что и FixedBaseTable.save
+        """
+        data = {
+            "x": hex(self.point.x),
+            "y": hex(self.point.y),
+            "model": "edwards",
+            "bits": self.bits,
+            "window": self.window,
+            "table": [[f"{u:x}:{v:x}" for u, v, _ in row] for row in self.table],
+        }
+        _write_json_atomic(path, data)
+
+    @classmethod
+    def load(cls, point: Point, edwards: TwistedEdwardsCurve, path) -> Self:
+        """
+        Загружает таблицу, сохраненную методом save, для той же точки point
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if int(data["x"], 16) != point.x or int(data["y"], 16) != point.y:
+            raise ValueError("The table was built for a different point.")
+        if data.get("model") != "edwards":
+            raise ValueError("The table was built for a Weierstrass curve.")
+        table = []
+        for row in data["table"]:
+            entries = []
+            for entry in row:
+                u, v = (int(c, 16) for c in entry.split(":"))
+                if not edwards.is_point_on_curve(u, v):
+                    raise ValueError("The table contains a point that is not on the curve.")
+                entries.append((u, v, edwards.d * u * v % edwards.p))
+            table.append(entries)
+        return cls(point, edwards, data["bits"], data["window"], table)
+
+
+def _wnaf(n: int, window: int) -> list[int]:
+    """
+    Представление n > 0 в форме w-NAF, младшая цифра первой
+    """
+    digits = []
+    modulus = 1 << window
+    half = modulus >> 1
+    while n:
+        if n & 1:
+            digit = n & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            n -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        n >>= 1
+    return digits
+
+
+def _jacobian_double(P: tuple[int, int, int], a: int, p: int) -> tuple[int, int, int]:
+    """
+    Удвоение точки (X : Y : Z) в координатах Якоби, x = X / Z^2, y = Y / Z^3.
+    Бесконечно удаленная точка представлена Z = 0
+    """
+    X, Y, Z = P
+    if Z == 0 or Y == 0:
+        return (1, 1, 0)
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    ZZ = Z * Z % p
+    M = (3 * X * X + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return (X3, Y3, Z3)
+
+
+def _jacobian_add(P: tuple[int, int, int], Q: tuple[int, int, int], a: int, p: int) -> tuple[int, int, int]:
+    """
+    Сложение двух точек в координатах Якоби
+    """
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    r = (S2 - S1) % p
+    if H == 0:
+        return _jacobian_double(P, a, p) if r == 0 else (1, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * Z2 * H % p
+    return (X3, Y3, Z3)
+
+
+def _jacobian_add_affine(P: tuple[int, int, int], x2: int, y2: int, a: int, p: int) -> tuple[int, int, int]:
+    """
+    Смешанное сложение: точка в координатах Якоби плюс аффинная точка (x2, y2)
+    """
+    X1, Y1, Z1 = P
+    if Z1 == 0:
+        return (x2, y2, 1)
+    Z1Z1 = Z1 * Z1 % p
+    H = (x2 * Z1Z1 - X1) % p
+    r = (y2 * Z1 * Z1Z1 - Y1) % p
+    if H == 0:
+        return _jacobian_double(P, a, p) if r == 0 else (1, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return (X3, Y3, Z3)
+
+
+def _jacobian_to_point(curve: EllipticCurve, P: tuple[int, int, int]) -> Point:
+    X, Y, Z = P
+    if Z == 0:
+        return Point._trusted(curve, None, None)
+    z_inv = pow(Z, -1, curve.p)
+    z_inv2 = z_inv * z_inv % curve.p
+    return Point._trusted(curve, X * z_inv2 % curve.p, Y * z_inv2 * z_inv % curve.p)
+
+
+def _jacobian_to_affine_batch(points: list[tuple[int, int, int]], p: int) -> list[tuple[int, int]]:
+    """
+    Переводит список конечных точек из координат Якоби в аффинные
+    одним обращением по модулю (трюк Монтгомери)
+    """
+    prefix = []
+    acc = 1
+    for _, _, Z in points:
+        if Z == 0:
+            raise ValueError("Cannot convert the point at infinity to affine coordinates.")
+        prefix.append(acc)
+        acc = acc * Z % p
+    inv = pow(acc, -1, p)
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[i]
+        z_inv = inv * prefix[i] % p
+        inv = inv * Z % p
+        z_inv2 = z_inv * z_inv % p
+        result[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    return result
+
+
+def _jacobian_x_mod_equals(P: tuple[int, int, int], r: int, q: int, p: int) -> bool:
+    """
+    Проверяет x mod q == r для точки в координатах Якоби без обращения:
+    x = X / Z^2, поэтому сравнивается X с (r + kq) * Z^2 для всех r + kq < p
+    """
+    X, _, Z = P
+    if Z == 0 or not 0 <= r < q:
+        return False
+    ZZ = Z * Z % p
+    x = r
+    while x < p:
+        if X == x * ZZ % p:
+            return True
+        x += q
+    return False
+
+
+def _edwards_add(P: tuple, Q: tuple, e: int, d: int, p: int) -> tuple[int, int, int, int]:
+    """
+    Единое сложение точек кривой Эдвардса в расширенных координатах (X : Y : T : Z),
+    u = X / Z, v = Y / Z, T = XY / Z. Формулы верны и при P = Q, и для нейтральной точки (0 : 1 : 0 : 1)
+    """
+    X1, Y1, T1, Z1 = P
+    X2, Y2, T2, Z2 = Q
+    A = X1 * X2 % p
+    B = Y1 * Y2 % p
+    C = d * T1 * T2 % p
+    D = Z1 * Z2 % p
+    E = ((X1 + Y1) * (X2 + Y2) - A - B) % p
+    F = D - C
+    G = D + C
+    H = B - e * A
+    return (E * F % p, G * H % p, E * H % p, F * G % p)
+
+
+def _edwards_add_affine(P: tuple, u2: int, v2: int, w2: int, e: int, p: int) -> tuple[int, int, int, int]:
+    """
+    Смешанное единое сложение с аффинной точкой (u2, v2), w2 = d * u2 * v2
+    """
+    X1, Y1, T1, Z1 = P
+    A = X1 * u2 % p
+    B = Y1 * v2 % p
+    C = T1 * w2 % p
+    E = ((X1 + Y1) * (u2 + v2) - A - B) % p
+    F = Z1 - C
+    G = Z1 + C
+    H = B - e * A
+    return (E * F % p, G * H % p, E * H % p, F * G % p)
+
+
+def _edwards_to_affine_batch(points: list[tuple], p: int) -> list[tuple[int, int]]:
+    """
+    Переводит точки из расширенных координат в аффинные одним обращением
+    """
+    prefix = []
+    acc = 1
+    for _, _, _, Z in points:
+        prefix.append(acc)
+        acc = acc * Z % p
+    inv = pow(acc, -1, p)
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        X, Y, _, Z = points[i]
+        z_inv = inv * prefix[i] % p
+        inv = inv * Z % p
+        result[i] = (X * z_inv % p, Y * z_inv % p)
+    return result
+
+
+def _edwards_to_jacobian(edwards: TwistedEdwardsCurve, P: tuple) -> tuple[int, int, int]:
+    """
+    Переводит точку кривой Эдвардса в координаты Якоби эквивалентной кривой Вейерштрасса
+    без обращения: x = (s(Z + Y) + t(Z - Y)) / (Z - Y), y = sZ(Z + Y) / ((Z - Y)X),
+    знаменатель координат Якоби берется равным (Z - Y)X
+    """
+    X, Y, _, Z = P
+    p = edwards.p
+    if X % p == 0:
+        # Нейтральная точка или точка второго порядка: для подгруппы простого порядка - бесконечность
+        return (1, 1, 0)
+    N = (Z + Y) % p
+    D = (Z - Y) % p
+    Zj = D * X % p
+    ZZ = Zj * Zj % p
+    Xj = (edwards.s * N + edwards.t * D) * D * X * X % p
+    Yj = edwards.s * Z * N % p * ZZ % p
+    return (Xj, Yj, Zj)
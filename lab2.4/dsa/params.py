@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ParameterSet:
+    """
+    Параметры схемы подписи ГОСТ 34.10-2012.
+
+    Кривая всегда задается в форме Вейерштрасса y^2 = x^3 + ax + b (mod p) с образующей
+    P = (x, y) порядка q и порядком группы точек m. Для наборов на скрученных кривых
+    Эдвардса дополнительно заданы коэффиценты e и d: по ним строится эквивалентная
+    кривая Эдвардса, на которой считаются кратные P.
+    """
+
+    name: str
+    p: int
+    a: int
+    b: int
+    m: int
+    q: int
+    x: int
+    y: int
+    hash_size: int = 256
+    e: int = None
+    d: int = None
+
+    @property
+    def size(self) -> int:
+        """
+        :return: Длина ключей и половин подписи в байтах
+        """
+        return self.hash_size // 8
+
+    @property
+    def is_edwards(self) -> bool:
+        return self.e is not None
+
+
+_P256A = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFD97
+_P256C = 0x8000000000000000000000000000000000000000000000000000000000000C99
+_P256D = 0x9B9F605F5A858107AB1EC85E6B41C8AACF846E86789051D37998F7B9022D759B
+_P512A = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFDC7
+_P512B = 0x8000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000006F
+
+_PARAMETER_SETS = [
+    # Пример из ГОСТ 34.10-2012 (приложение А.1)
+    ParameterSet(
+        name="test-256",
+        p=0x8000000000000000000000000000000000000000000000000000000000000431,
+        a=0x07,
+        b=0x5FBFF498AA938CE739B8E022FBAFEF40563F6E6A3472FC2A514C0CE9DAE23B7E,
+        m=0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3,
+        q=0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3,
+        x=0x02,
+        y=0x08E2A8A0E65147D4BD6316030E16D19C85C97F0A9CA267122B96ABBCEA7E8FC8,
+    ),
+    # id-tc26-gost-3410-2012-256-paramSetA, скрученная кривая Эдвардса
+    ParameterSet(
+        name="tc26-256-A",
+        p=_P256A,
+        a=0xC2173F1513981673AF4892C23035A27CE25E2013BF95AA33B22C656F277E7335,
+        b=0x295F9BAE7428ED9CCC20E7C359A9D41A22FCCD9108E17BF7BA9337A6F8AE9513,
+        m=0x01000000000000000000000000000000003F63377F21ED98D70456BD55B0D8319C,
+        q=0x400000000000000000000000000000000FD8CDDFC87B6635C115AF556C360C67,
+        x=0x91E38443A5E82C0D880923425712B2BB658B9196932E02C78B2582FE742DAA28,
+        y=0x32879423AB1A0375895786C4BB46E9565FDE0B5344766740AF268ADB32322E5C,
+        e=0x01,
+        d=0x0605F6B7C183FA81578BC39CFAD518132B9DF62897009AF7E522C32D6DC7BFFB,
+    ),
+    # id-tc26-gost-3410-2012-256-paramSetB (CryptoPro-A)
+    ParameterSet(
+        name="tc26-256-B",
+        p=_P256A,
+        a=_P256A - 3,
+        b=0xA6,
+        m=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF6C611070995AD10045841B09B761B893,
+        q=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF6C611070995AD10045841B09B761B893,
+        x=0x01,
+        y=0x8D91E471E0989CDA27DF505A453F2B7635294F2DDF23E3B122ACC99C9E9F1E14,
+    ),
+    # id-tc26-gost-3410-2012-256-paramSetC (CryptoPro-B)
+    ParameterSet(
+        name="tc26-256-C",
+        p=_P256C,
+        a=_P256C - 3,
+        b=0x3E1AF419A269A5F866A7D3C25C3DF80AE979259373FF2B182F49D4CE7E1BBC8B,
+        m=0x800000000000000000000000000000015F700CFFF1A624E5E497161BCC8A198F,
+        q=0x800000000000000000000000000000015F700CFFF1A624E5E497161BCC8A198F,
+        x=0x01,
+        y=0x3FA8124359F96680B83D1C3EB2C070E5C545C9858D03ECFB744BF8D717717EFC,
+    ),
+    # id-tc26-gost-3410-2012-256-paramSetD (CryptoPro-C)
+    ParameterSet(
+        name="tc26-256-D",
+        p=_P256D,
+        a=_P256D - 3,
+        b=0x805A,
+        m=0x9B9F605F5A858107AB1EC85E6B41C8AA582CA3511EDDFB74F02F3A6598980BB9,
+        q=0x9B9F605F5A858107AB1EC85E6B41C8AA582CA3511EDDFB74F02F3A6598980BB9,
+        x=0x00,
+        y=0x41ECE55743711A8C3CBF3783CD08C0EE4D4DC440D4641A8F366E550DFDB3BB67,
+    ),
+    # Пример из ГОСТ 34.10-2012 (приложение А.2)
+    ParameterSet(
+        name="test-512",
+        p=0x4531ACD1FE0023C7550D267B6B2FEE80922B14B2FFB90F04D4EB7C09B5D2D15DF1D852741AF4704A0458047E80E4546D35B8336FAC224DD81664BBF528BE6373,
+        a=0x07,
+        b=0x1CFF0806A31116DA29D8CFA54E57EB748BC5F377E49400FDD788B649ECA1AC4361834013B2AD7322480A89CA58E0CF74BC9E540C2ADD6897FAD0A3084F302ADC,
+        m=0x4531ACD1FE0023C7550D267B6B2FEE80922B14B2FFB90F04D4EB7C09B5D2D15DA82F2D7ECB1DBAC719905C5EECC423F1D86E25EDBE23C595D644AAF187E6E6DF,
+        q=0x4531ACD1FE0023C7550D267B6B2FEE80922B14B2FFB90F04D4EB7C09B5D2D15DA82F2D7ECB1DBAC719905C5EECC423F1D86E25EDBE23C595D644AAF187E6E6DF,
+        x=0x24D19CC64572EE30F396BF6EBBFD7A6C5213B3B3D7057CC825F91093A68CD762FD60611262CD838DC6B60AA7EEE804E28BC849977FAC33B4B530F1B120248A9A,
+        y=0x2BB312A43BD2CE6E0D020613C857ACDDCFBF061E91E5F2C3F32447C259F39B2C83AB156D77F1496BF7EB3351E1EE4E43DC1A18B91B24640B6DBB92CB1ADD371E,
+        hash_size=512,
+    ),
+    # id-tc26-gost-3410-12-512-paramSetA
+    ParameterSet(
+        name="tc26-512-A",
+        p=_P512A,
+        a=_P512A - 3,
+        b=0xE8C2505DEDFC86DDC1BD0B2B6667F1DA34B82574761CB0E879BD081CFD0B6265EE3CB090F30D27614CB4574010DA90DD862EF9D4EBEE4761503190785A71C760,
+        m=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF27E69532F48D89116FF22B8D4E0560609B4B38ABFAD2B85DCACDB1411F10B275,
+        q=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF27E69532F48D89116FF22B8D4E0560609B4B38ABFAD2B85DCACDB1411F10B275,
+        x=0x03,
+        y=0x7503CFE87A836AE3A61B8816E25450E6CE5E1C93ACF1ABC1778064FDCBEFA921DF1626BE4FD036E93D75E6A50E3A41E98028FE5FC235F5B889A589CB5215F2A4,
+        hash_size=512,
+    ),
+    # id-tc26-gost-3410-12-512-paramSetB
+    ParameterSet(
+        name="tc26-512-B",
+        p=_P512B,
+        a=_P512B - 3,
+        b=0x687D1B459DC841457E3E06CF6F5E2517B97C7D614AF138BCBF85DC806C4B289F3E965D2DB1416D217F8B276FAD1AB69C50F78BEE1FA3106EFB8CCBC7C5140116,
+        m=0x800000000000000000000000000000000000000000000000000000000000000149A1EC142565A545ACFDB77BD9D40CFA8B996712101BEA0EC6346C54374F25BD,
+        q=0x800000000000000000000000000000000000000000000000000000000000000149A1EC142565A545ACFDB77BD9D40CFA8B996712101BEA0EC6346C54374F25BD,
+        x=0x02,
+        y=0x1A8F7EDA389B094C2C071E3647A8940F3C123B697578C213BE6DD9E6C8EC7335DCB228FD1EDF4A39152CBCAAF8C0398828041055F94CEEEC7E21340780FE41BD,
+        hash_size=512,
+    ),
+    # id-tc26-gost-3410-2012-512-paramSetC, скрученная кривая Эдвардса
+    ParameterSet(
+        name="tc26-512-C",
+        p=_P512A,
+        a=0xDC9203E514A721875485A529D2C722FB187BC8980EB866644DE41C68E143064546E861C0E2C9EDD92ADE71F46FCF50FF2AD97F951FDA9F2A2EB6546F39689BD3,
+        b=0xB4C4EE28CEBC6C2C8AC12952CF37F16AC7EFB6A9F69F4B57FFDA2E4F0DE5ADE038CBC2FFF719D2C18DE0284B8BFEF3B52B8CC7A5F5BF0A3C8D2319A5312557E1,
+        m=0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF26336E91941AAC0130CEA7FD451D40B323B6A79E9DA6849A5188F3BD1FC08FB4,
+        q=0x3FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC98CDBA46506AB004C33A9FF5147502CC8EDA9E7A769A12694623CEF47F023ED,
+        x=0xE2E31EDFC23DE7BDEBE241CE593EF5DE2295B7A9CBAEF021D385F7074CEA043AA27272A7AE602BF2A7B9033DB9ED3610C6FB85487EAE97AAC5BC7928C1950148,
+        y=0xF5CE40D95B5EB899ABBCCFF5911CB8577939804D6527378B8C108C3D2090FF9BE18E2D33E3021ED2EF32D85822423B6304F726AA854BAE07D0396E9A9ADDC40F,
+        hash_size=512,
+        e=0x01,
+        d=0x9E4F5D8C017D8D9F13A5CF3CDF5BFE4DAB402D54198E31EBDE28A0621050439CA6B39E0A515C06B304E2CE43E79E369E91A0CFC2BC2A22B4CA302DBB33EE7550,
+    ),
+]
+
+PARAMETER_SETS: dict[str, ParameterSet] = {params.name: params for params in _PARAMETER_SETS}
+DEFAULT_PARAMETER_SET = "test-256"
+
+
+def get_parameter_set(params: str | ParameterSet) -> ParameterSet:
+    """
+    :param: params: Имя набора параметров из PARAMETER_SETS или сам набор
+    :return: Набор параметров
+    """
+    if isinstance(params, ParameterSet):
+        return params
+    try:
+        return PARAMETER_SETS[params]
+    except KeyError:
+        raise ValueError(f"Unknown parameter set: {params}. Known sets: {', '.join(PARAMETER_SETS)}.") from None
@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from .gost341012 import GostDSA
+from .params import DEFAULT_PARAMETER_SET, ParameterSet
+
+_worker_dsa: GostDSA = None
+
+
+def _init_worker(table_path: str, key_cache_bytes: int, param_set: str | ParameterSet):
+    global _worker_dsa
+    _worker_dsa = GostDSA(table_path=table_path, key_cache_bytes=key_cache_bytes, param_set=param_set)
+    _worker_dsa._base_table()
+
+
+def _sign(message: bytes, private_key: str) -> str:
+    return _worker_dsa.sign(message, private_key)
+
+
+def _check(signature: str, message: bytes, public_key: str) -> bool:
+    return _worker_dsa.check(signature, message, public_key)
+
+
+def _sign_chunk(chunk: list[tuple[bytes, str]]) -> list[str]:
+    return [_worker_dsa.sign(message, private_key) for message, private_key in chunk]
+
+
+def _check_chunk(chunk: list[tuple[str, bytes, str]]) -> list[bool]:
+    return _worker_dsa.check_many(chunk)
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class GostDSAPool:
+    def __init__(
+        self,
+        workers: int = None,
+        table_path: str = None,
+        key_cache_bytes: int = None,
+        param_set: str | ParameterSet = DEFAULT_PARAMETER_SET,
+    ):
+        """
+        Пул процессов для подписи и проверки по ГОСТ 34.10-2012.
+
+        Каждый процесс держит свой экземпляр GostDSA с уже построенной таблицей
+        кратных P и собственным кэшем открытых ключей, поэтому пропускная
+        способность растет с числом ядер.
+
+        :param: workers: Число процессов, по умолчанию по числу ядер
+        :param: table_path: Файл таблицы кратных P, общий для всех процессов
+        :param: key_cache_bytes: Ограничение памяти кэша ключей в каждом процессе,
+            по умолчанию как у GostDSA
+        :param: param_set: Набор параметров ГОСТ 34.10-2012, как у GostDSA
+        """
+        self.workers = workers or os.cpu_count() or 1
+        if table_path and not os.path.exists(table_path):
+            # Строим таблицу один раз здесь, чтобы процессы только загружали ее
+            GostDSA(table_path=table_path, param_set=param_set)._base_table()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(table_path, key_cache_bytes, param_set),
+        )
+
+    def submit_sign(self, message: bytes, private_key: str) -> Future:
+        """
+        :return: Future с подписью, как у GostDSA.sign
+        """
+        return self._executor.submit(_sign, message, private_key)
+
+    def submit_check(self, signature: str, message: bytes, public_key: str) -> Future:
+        """
+        :return: Future с результатом проверки, как у GostDSA.check
+        """
+        return self._executor.submit(_check, signature, message, public_key)
+
+    def submit_check_many(self, items: list[tuple[str, bytes, str]]) -> Future:
+        """
+        :return: Future со списком результатов, как у GostDSA.check_many
+        """
+        return self._executor.submit(_check_chunk, items)
+
+    def map_sign(self, items: Iterable[tuple[bytes, str]], chunksize: int = 64) -> Iterator[str]:
+        """
+        Подписывает пары (message, private_key) и возвращает подписи в исходном порядке.
+        Задачи отправляются пачками по chunksize, чтобы накладные расходы на
+        передачу между процессами не съедали выигрыш
+        """
+        for result in self._executor.map(_sign_chunk, _chunks(items, chunksize)):
+            yield from result
+
+    def map_check(self, items: Iterable[tuple[str, bytes, str]], chunksize: int = 256) -> Iterator[bool]:
+        """
+        Проверяет тройки (signature, message, public_key) в исходном порядке.
+        Каждая пачка проверяется в процессе через GostDSA.check_many
+        """
+        for result in self._executor.map(_check_chunk, _chunks(items, chunksize)):
+            yield from result
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "GostDSAPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -0,0 +1,348 @@
+import asyncio
+import bisect
+import contextlib
+import ipaddress
+import json
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .gost341012 import GostDSA
+from .pool import GostDSAPool
+
+# Кадр: длина (4 байта) и тело. Тело запроса: код операции (1 байт), номер запроса
+# (4 байта) и поля; тело ответа: номер запроса, статус (1 байт) и поля.
+# Каждое поле - длина (4 байта) и байты. Запрос OP_SIGN несет закрытый ключ
+# открытым текстом, поэтому сокет должен быть доступен только локально.
+OP_SIGN = 1
+OP_CHECK = 2
+OP_STATS = 3
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_HEADER = struct.Struct(">I")
+_REQUEST = struct.Struct(">BI")
+_RESPONSE = struct.Struct(">IB")
+MAX_FRAME = 64 * 1024 * 1024
+
+
+def encode_fields(*fields: bytes) -> bytes:
+    return b"".join(_HEADER.pack(len(field)) + field for field in fields)
+
+
+def decode_fields(data: bytes) -> list[bytes]:
+    fields = []
+    offset = 0
+    while offset < len(data):
+        (size,) = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        if offset + size > len(data):
+            raise ValueError("Truncated field.")
+        fields.append(data[offset:offset + size])
+        offset += size
+    return fields
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME:
+        raise ValueError("Frame is too large.")
+    return await reader.readexactly(size)
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    writer.write(_HEADER.pack(len(payload)) + payload)
+
+
+class LatencyHistogram:
+    # Границы корзин в миллисекундах: от 0.05 мс с шагом x2 до ~100 с
+    BOUNDS = [0.05 * 2**i for i in range(22)]
+
+    def __init__(self):
+        """
+        Гистограмма задержек с логарифмическими корзинами
+        """
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def record(self, ms: float):
+        self.counts[bisect.bisect_left(self.BOUNDS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def quantile(self, q: float) -> float:
+        """
+        :return: Верхняя граница корзины, в которую попадает квантиль q, в мс
+        """
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.total,
+            "mean_ms": self.sum_ms / self.total if self.total else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {f"<={bound:g}": count for bound, count in zip(self.BOUNDS, self.counts) if count},
+        }
+
+
+class GostDSAService:
+    def __init__(
+        self,
+        dsa: GostDSA = None,
+        pool: GostDSAPool = None,
+        batch_size: int = 256,
+        batch_delay: float = 0.002,
+    ):
+        """
+        Asyncio-сервис подписи и проверки по ГОСТ 34.10-2012 на локальном сокете.
+
+        Проверки от всех соединений собираются в микропакеты (до batch_size штук
+        или batch_delay секунд ожидания) и выполняются одним вызовом check_many.
+        Вычисления уходят из цикла событий: в пул процессов, если он передан,
+        иначе в отдельный поток с экземпляром GostDSA.
+
+        Подпись принимает закрытый ключ прямо в запросе, поэтому сервис слушает
+        только локальные адреса: unix-сокет (доступ к нему ограничивается правами
+        на файл) или loopback-интерфейс.
+
+        :param: dsa: Экземпляр GostDSA для работы без пула процессов
+        :param: pool: Пул процессов GostDSAPool
+        :param: batch_size: Максимальный размер микропакета проверок
+        :param: batch_delay: Сколько ждать пополнения микропакета, с
+        """
+        self.pool = pool
+        self.dsa = dsa if dsa is not None or pool is not None else GostDSA()
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.histograms = {"sign": LatencyHistogram(), "check": LatencyHistogram(), "batch": LatencyHistogram()}
+        self.batch_sizes = LatencyHistogram()
+        self._executor = ThreadPoolExecutor(max_workers=1) if pool is None else None
+        self._checks: asyncio.Queue = None
+        self._batcher: asyncio.Task = None
+        self._server: asyncio.AbstractServer = None
+
+    async def start_unix(self, path: str):
+        self._start_batcher()
+        self._server = await asyncio.start_unix_server(self._handle, path=path)
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        :param: host: Loopback-адрес; прочие адреса отклоняются, так как по сокету передаются закрытые ключи
+        :return: Фактический порт (полезно при port = 0)
+        """
+        if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"The service carries private keys and only listens on loopback, not {host}.")
+        self._start_batcher()
+        self._server = await asyncio.start_server(self._handle, host=host, port=port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batcher
+            self._batcher = None
+            # Проверки, которые батчер так и не забрал из очереди, иначе ждали бы вечно
+            while not self._checks.empty():
+                _, future = self._checks.get_nowait()
+                if not future.done():
+                    future.set_exception(ConnectionError("The service is closed."))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        result = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        result["batch_sizes"] = self.batch_sizes.snapshot()
+        if self.dsa is not None:
+            result["key_cache"] = self.dsa.key_cache.stats()
+        return result
+
+    def _start_batcher(self):
+        if self._batcher is None:
+            self._checks = asyncio.Queue()
+            self._batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._checks.get()]
+                deadline = loop.time() + self.batch_delay
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._checks.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                items = [item for item, _ in batch]
+                started = time.perf_counter()
+                try:
+                    if self.pool is not None:
+                        results = await asyncio.wrap_future(self.pool.submit_check_many(items))
+                    else:
+                        results = await loop.run_in_executor(self._executor, self.dsa.check_many, items)
+                except Exception as error:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                self.histograms["batch"].record((time.perf_counter() - started) * 1000)
+                self.batch_sizes.record(len(batch))
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            # Пакет, прерванный закрытием сервиса, завершается ошибкой
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ConnectionError("The service is closed."))
+            raise
+
+    async def _sign(self, message: bytes, private_key: str) -> str:
+        if self.pool is not None:
+            return await asyncio.wrap_future(self.pool.submit_sign(message, private_key))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.dsa.sign, message, private_key)
+
+    async def _check(self, signature: str, message: bytes, public_key: str) -> bool:
+        if self._batcher is None:
+            raise ConnectionError("The service is closed.")
+        future = asyncio.get_running_loop().create_future()
+        await self._checks.put(((signature, message, public_key), future))
+        return await future
+
+    async def _process(self, op: int, fields: list[bytes]) -> list[bytes]:
+        if op == OP_SIGN:
+            message, private_key = fields
+            return [(await self._sign(message, private_key.decode("ascii"))).encode("ascii")]
+        if op == OP_CHECK:
+            signature, message, public_key = fields
+            ok = await self._check(signature.decode("ascii"), message, public_key.decode("ascii"))
+            return [b"\x01" if ok else b"\x00"]
+        if op == OP_STATS:
+            return [json.dumps(self.stats()).encode("utf-8")]
+        raise ValueError(f"Unknown operation {op}.")
+
+    async def _respond(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, request_id: int, op: int, fields):
+        started = time.perf_counter()
+        try:
+            payload = _RESPONSE.pack(request_id, STATUS_OK) + encode_fields(*await self._process(op, fields))
+        except Exception as error:
+            payload = _RESPONSE.pack(request_id, STATUS_ERROR) + encode_fields(str(error).encode("utf-8"))
+        name = {OP_SIGN: "sign", OP_CHECK: "check"}.get(op)
+        if name:
+            self.histograms[name].record((time.perf_counter() - started) * 1000)
+        async with lock:
+            write_frame(writer, payload)
+            await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    frame = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                op, request_id = _REQUEST.unpack_from(frame)
+                fields = decode_fields(frame[_REQUEST.size:])
+                # Запросы одного соединения обрабатываются параллельно, чтобы проверки попадали в общий пакет
+                task = asyncio.create_task(self._respond(writer, lock, request_id, op, fields))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ValueError, struct.error, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class GostDSAClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Асинхронный клиент GostDSAService. Запросы можно отправлять конкурентно
+        по одному соединению: ответы сопоставляются по номеру запроса
+        """
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "GostDSAClient":
+        return cls(*await asyncio.open_unix_connection(path))
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "GostDSAClient":
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def _read_responses(self):
+        try:
+            while True:
+                frame = await read_frame(self._reader)
+                request_id, status = _RESPONSE.unpack_from(frame)
+                fields = decode_fields(frame[_RESPONSE.size:])
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(fields)
+                else:
+                    future.set_exception(RuntimeError(fields[0].decode("utf-8")))
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection closed: {error}"))
+            self._pending.clear()
+
+    async def _request(self, op: int, *fields: bytes) -> list[bytes]:
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        write_frame(self._writer, _REQUEST.pack(op, request_id) + encode_fields(*fields))
+        await self._writer.drain()
+        return await future
+
+    async def sign(self, message: bytes, private_key: str) -> str:
+        (signature,) = await self._request(OP_SIGN, message, private_key.encode("ascii"))
+        return signature.decode("ascii")
+
+    async def check(self, signature: str, message: bytes, public_key: str) -> bool:
+        (result,) = await self._request(
+            OP_CHECK, signature.encode("ascii"), message, public_key.encode("ascii")
+        )
+        return result == b"\x01"
+
+    async def stats(self) -> dict:
+        (data,) = await self._request(OP_STATS)
+        return json.loads(data)
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._reader_task.cancel()
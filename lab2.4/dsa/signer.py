@@ -0,0 +1,103 @@
+import queue
+import threading
+
+from .gost341012 import GostDSA
+
+
+class GostSigner:
+    def __init__(self, dsa: GostDSA, private_key: str | bytes, pool_size: int = 64, background: bool = True):
+        """
+        Подписывающая сторона с заранее вычисленными одноразовыми ключами.
+
+        Пары (k, r = x(kP) mod q) не зависят от сообщения, поэтому фоновый поток
+        заполняет ими ограниченный пул, пока сервис простаивает. Онлайн-подпись
+        берет готовую пару и считает только хэш и s = (rd + ke) mod q. Если пул
+        пуст, пара вычисляется на месте, как в GostDSA.sign.
+
+        :param: dsa: Экземпляр GostDSA
+        :param: private_key: Закрытый ключ в виде шестнадцатеричной строки или байтов
+        :param: pool_size: Максимальное число заготовленных пар
+        :param: background: Запустить фоновый поток заполнения пула
+        """
+        self.dsa = dsa
+        self.d = int(private_key, 16) if isinstance(private_key, str) else int.from_bytes(private_key)
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self._pool: queue.Queue[tuple[int, int]] = queue.Queue(maxsize=pool_size)
+        self._stop = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._fill_forever, name="gost-nonce-pool", daemon=True)
+            self._thread.start()
+
+    def _fill_forever(self):
+        while not self._stop.is_set():
+            pair = self.dsa._find_r()
+            while not self._stop.is_set():
+                try:
+                    self._pool.put(pair, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def fill(self, count: int = None):
+        """
+        Синхронно дозаполняет пул, например при старте сервиса
+
+        :param: count: Сколько пар добавить, по умолчанию до заполнения пула
+        """
+        added = 0
+        while count is None or added < count:
+            try:
+                self._pool.put_nowait(self.dsa._find_r())
+            except queue.Full:
+                break
+            added += 1
+
+    def _take_nonce(self) -> tuple[int, int]:
+        try:
+            pair = self._pool.get_nowait()
+            self.pool_hits += 1
+            return pair
+        except queue.Empty:
+            self.pool_misses += 1
+            return self.dsa._find_r()
+
+    def sign(self, message: bytes) -> str:
+        """
+        Подписывает сообщение закрытым ключом этого объекта, результат совместим с GostDSA.check
+
+        :param: message: Подписываемое сообщение в байтах
+        :return: Шестнадцетиричная строка из конкатенированных двух векторов (r|s)
+        """
+        return self.sign_bytes(message).hex()
+
+    def sign_bytes(self, message: bytes | memoryview) -> bytes:
+        """
+        То же, что sign, но подпись r|s возвращается в байтах, как у GostDSA.sign_bytes
+        """
+        q = self.dsa.q
+        e = self.dsa._message_scalar(message)
+        s = 0
+        while s == 0:
+            r, k = self._take_nonce()
+            s = (r * self.d + k * e) % q
+
+        return r.to_bytes(self.dsa.size) + s.to_bytes(self.dsa.size)
+
+    def pool_size(self) -> int:
+        """
+        :return: Текущее число заготовленных пар
+        """
+        return self._pool.qsize()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "GostSigner":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
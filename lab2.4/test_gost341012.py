@@ -0,0 +1,44 @@
+from dsa.gost341012 import GostDSA
+from dsa.lib.curve import Point
+
+
+def small_order_point(dsa: GostDSA) -> Point:
+    """
+    Точка второго порядка (x, 0) на кривой с кофактором m / q > 1
+    """
+    x = 0
+    while True:
+        x += 1
+        try:
+            R = Point.uncompress_bytes(dsa.curve, b"\x02" + x.to_bytes(dsa.size))
+        except ValueError:
+            continue
+        T = (dsa.m // 2) * R
+        if T.x is not None:
+            return T
+
+
+def test_small_order_key_is_rejected():
+    dsa = GostDSA(param_set="tc26-256-A")
+    Q = small_order_point(dsa)
+    assert Q.y == 0
+    private_key, _ = dsa.generate_key_pair()
+    signature = dsa.sign(b"message", private_key)
+
+    assert dsa.check(signature, b"message", Q.compress()) is False
+    assert dsa.check_bytes(bytes.fromhex(signature), b"message", Q.compress_bytes()) is False
+    assert dsa.check_many([(signature, b"message", Q.compress())]) == [False]
+
+
+def test_small_order_key_is_rejected_after_table_after_uses():
+    dsa = GostDSA(param_set="tc26-256-A")
+    public_key = small_order_point(dsa).compress()
+    private_key, _ = dsa.generate_key_pair()
+    signature = dsa.sign(b"message", private_key)
+
+    for _ in range(2 * dsa.key_cache.table_after):
+        assert dsa.check(signature, b"message", public_key) is False
+    assert dsa.check_many([(signature, b"message", public_key)] * dsa.key_cache.table_after) == \
+        [False] * dsa.key_cache.table_after
+    assert not dsa.key_cache.get(public_key).valid
+    assert dsa.key_cache.get(public_key).table is None